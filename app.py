@@ -1,8 +1,11 @@
-from flask import Flask
+from flask import Flask, request, redirect, url_for, flash
 from dotenv import load_dotenv
+import click
 import os
 import pymysql
 
+from services import db, assets, blobstore, cache, compression, file_gc, hashing, mailer, metrics, migrations, query_plans, sessions, slow_queries, sqlite_db, thumbnails
+from services.repos import TopicRepo
 from blueprints.main import main_bp
 from blueprints.auth import auth_bp
 from blueprints.topic import topic_bp
@@ -10,113 +13,215 @@ from blueprints.user import user_bp
 
 load_dotenv()
 
-def create_app():
+def load_db_config():
+    return {
+        'host': os.getenv('DB_HOST', '127.0.0.1'),
+        'port': int(os.getenv('DB_PORT', 3306)),
+        'user': os.getenv('DB_USER', 'root'),
+        'password': os.getenv('DB_PASSWORD'),
+        'db': os.getenv('DB_NAME', 'board'),
+        'charset': 'utf8mb4'
+    }
+
+def create_app(preload=False):
     app = Flask(__name__)
-    app.secret_key = os.urandom(24)
+    secret_key = os.getenv('SECRET_KEY')
+    if not secret_key:
+        print("SECRET_KEY가 설정되지 않아 임시 키를 사용합니다. 여러 프로세스로 실행하면 세션이 유지되지 않습니다.")
+        secret_key = os.urandom(24)
+    app.secret_key = secret_key
 
-    db_password = os.getenv('DB_PASSWORD')
     mail_address = os.getenv('MAIL_ADRESS')
     mail_password = os.getenv('MAIL_PASSWORD')
 
-    db_config = {
-        'host': '127.0.0.1',
-        'port': 3306,
-        'user': 'root',
-        'password': db_password,
-        'db': 'board',
-        'charset': 'utf8mb4'
-    }
+    db_config = load_db_config()
 
-    UPLOAD_FOLDER = 'static/uploads'
+    UPLOAD_FOLDER = os.getenv('UPLOAD_FOLDER', 'static/uploads')
     if not os.path.exists(UPLOAD_FOLDER):
         os.makedirs(UPLOAD_FOLDER)
 
     app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+    app.config['MAX_CONTENT_LENGTH'] = 31*1024*1024
+    app.config['THUMBNAIL_WORKERS'] = int(os.getenv('THUMBNAIL_WORKERS', 2))
+    app.config['THUMBNAIL_MAX_PENDING'] = int(os.getenv('THUMBNAIL_MAX_PENDING', 16))
+    app.config['FILE_GC_INTERVAL'] = float(os.getenv('FILE_GC_INTERVAL', 30))
+    app.config['FILE_GC_RECONCILE_INTERVAL'] = float(os.getenv('FILE_GC_RECONCILE_INTERVAL', 3600))
+    app.config['FILE_GC_BATCH_SIZE'] = int(os.getenv('FILE_GC_BATCH_SIZE', 500))
+    app.config['FILE_GC_GRACE'] = float(os.getenv('FILE_GC_GRACE', 3600))
+    app.config['DOWNLOAD_OFFLOAD'] = os.getenv('DOWNLOAD_OFFLOAD')
+    app.config['DOWNLOAD_ACCEL_PREFIX'] = os.getenv('DOWNLOAD_ACCEL_PREFIX', '/protected-uploads/')
     app.config['MAIL_SERVER'] = 'smtp.gmail.com'
     app.config['MAIL_PORT'] = 587
     app.config['MAIL_USE_TLS'] = True
     app.config['MAIL_USERNAME'] = mail_address
     app.config['MAIL_PASSWORD'] = mail_password
     app.config['MAIL_DEFAULT_SENDER'] = ('초코파이 인사이드', mail_address)
-
-    from flask_mail import Mail
-    mail = Mail(app)
+    app.config['MAIL_BACKEND'] = os.getenv('MAIL_BACKEND', 'smtp')
+    app.config['MAIL_QUEUE_SIZE'] = int(os.getenv('MAIL_QUEUE_SIZE', 100))
+    app.config['MAIL_BATCH_SIZE'] = int(os.getenv('MAIL_BATCH_SIZE', 20))
+    app.config['MAIL_MAX_RETRIES'] = int(os.getenv('MAIL_MAX_RETRIES', 3))
+    app.config['PASSWORD_HASH_METHOD'] = os.getenv('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    app.config['PASSWORD_HASH_WORKERS'] = int(os.getenv('PASSWORD_HASH_WORKERS', 2))
+    app.config['PASSWORD_HASH_MAX_PENDING'] = int(os.getenv('PASSWORD_HASH_MAX_PENDING', 8))
+    app.config['PASSWORD_HASH_TIMEOUT'] = float(os.getenv('PASSWORD_HASH_TIMEOUT', 3))
+    app.config['DB_BACKEND'] = os.getenv('DB_BACKEND', 'mysql')
+    app.config['SQLITE_PATH'] = os.getenv('SQLITE_PATH', 'board.sqlite3')
+    app.config['DB_POOL_MIN_SIZE'] = int(os.getenv('DB_POOL_MIN_SIZE', 2))
+    app.config['DB_POOL_MAX_SIZE'] = int(os.getenv('DB_POOL_MAX_SIZE', 10))
+    app.config['DB_POOL_TIMEOUT'] = float(os.getenv('DB_POOL_TIMEOUT', 5))
+    app.config['DB_POOL_RECYCLE'] = int(os.getenv('DB_POOL_RECYCLE', 3600))
+    app.config['TOPIC_LIST_CACHE_SIZE'] = int(os.getenv('TOPIC_LIST_CACHE_SIZE', 128))
+    app.config['TOPIC_LIST_CACHE_TTL'] = float(os.getenv('TOPIC_LIST_CACHE_TTL', 30))
+    app.config['TOPIC_CACHE_SIZE'] = int(os.getenv('TOPIC_CACHE_SIZE', 1024))
+    app.config['TOPIC_CACHE_TTL'] = float(os.getenv('TOPIC_CACHE_TTL', 300))
+    app.config['CACHE_VERSION_CHECK_INTERVAL'] = float(os.getenv('CACHE_VERSION_CHECK_INTERVAL', 1.0))
+    app.config['SLOW_QUERY_THRESHOLD_MS'] = float(os.getenv('SLOW_QUERY_THRESHOLD_MS', 200))
+    app.config['SLOW_QUERY_LOG_SIZE'] = int(os.getenv('SLOW_QUERY_LOG_SIZE', 100))
+    app.config['SLOW_QUERY_TOP_N'] = int(os.getenv('SLOW_QUERY_TOP_N', 20))
+    app.config['ADMIN_USER_IDS'] = os.getenv('ADMIN_USER_IDS', '')
+    app.config['METRICS_TOKEN'] = os.getenv('METRICS_TOKEN', '')
+    app.config['METRICS_DIR'] = os.getenv('METRICS_DIR', '')
+    app.config['METRICS_FLUSH_INTERVAL'] = float(os.getenv('METRICS_FLUSH_INTERVAL', 5))
+    app.config['SESSION_BACKEND'] = os.getenv('SESSION_BACKEND', 'sqlite')
+    app.config['SESSION_SQLITE_PATH'] = os.getenv('SESSION_SQLITE_PATH', 'sessions.sqlite3')
+    app.config['SESSION_MEMORY_MAX'] = int(os.getenv('SESSION_MEMORY_MAX', 10000))
+    app.config['SESSION_LIFETIME'] = int(os.getenv('SESSION_LIFETIME', 7*24*3600))
+    app.config['TOPIC_ACCESS_TTL'] = int(os.getenv('TOPIC_ACCESS_TTL', 3600))
+    app.config['COMPRESS_MIN_SIZE'] = int(os.getenv('COMPRESS_MIN_SIZE', 1024))
+    app.config['COMPRESS_GZIP_LEVEL'] = int(os.getenv('COMPRESS_GZIP_LEVEL', 6))
+    app.config['COMPRESS_BROTLI_QUALITY'] = int(os.getenv('COMPRESS_BROTLI_QUALITY', 5))
+    app.config['ASGI_SYNC_THREADS'] = int(os.getenv('ASGI_SYNC_THREADS', 8))
+    app.config['ASSETS_BUILD_ON_STARTUP'] = os.getenv('ASSETS_BUILD_ON_STARTUP', 'true').lower() == 'true'
+
+    sessions.init_sessions(app)
+    assets.init_assets(app)
+    compression.init_compression(app)
+    cache.init_caches(app)
+    thumbnails.init_thumbnails(app)
+    file_gc.init_sweeper(app)
+    if app.config['DB_BACKEND'] == 'sqlite':
+        db.init_pool(app, {'path': app.config['SQLITE_PATH']}, sqlite_db.SQLitePool)
+    else:
+        db.init_pool(app, db_config)
+
+    mail = mailer.init_mail(app)
+    hasher = hashing.init_hasher(app)
+    metrics.init_metrics(app, mail, hasher)
+    slow_queries.init_slow_query_log(app)
 
     from blueprints import auth, topic, user, main
-    auth.db_config = db_config
     auth.mail = mail
-    topic.db_config = db_config
+    auth.hasher = hasher
+    user.hasher = hasher
     topic.upload_folder = app.config['UPLOAD_FOLDER']
-    user.db_config = db_config
+    topic.download_offload = app.config['DOWNLOAD_OFFLOAD']
+    topic.accel_prefix = app.config['DOWNLOAD_ACCEL_PREFIX']
+    topic.topic_access_ttl = app.config['TOPIC_ACCESS_TTL']
     user.upload_folder = app.config['UPLOAD_FOLDER']
-    main.db_config = db_config
 
     app.register_blueprint(main_bp, url_prefix='/')
     app.register_blueprint(auth_bp, url_prefix='/auth')
     app.register_blueprint(topic_bp, url_prefix='/topic')
     app.register_blueprint(user_bp, url_prefix='/user')
 
+    @app.errorhandler(413)
+    def request_too_large(e):
+        flash('최대 30MB까지 허용됩니다.')
+        return redirect(request.referrer or url_for('main.main'))
+
+    @app.cli.command('reconcile-topic-count')
+    def reconcile_topic_count_command():
+        with db.pool.connection() as conn:
+            total_posts = TopicRepo(conn).reconcile_count()
+        print(f"게시글 수를 {total_posts}개로 다시 계산했습니다.")
+
+    @app.cli.command('sweep-uploads')
+    def sweep_uploads_command():
+        processed, removed = file_gc.sweeper.run_once(reconcile_orphans=True)
+        print(f"삭제 대기 {processed}건을 처리하고 고아 파일 {removed}개를 지웠습니다.")
+
+    @app.cli.command('migrate-uploads')
+    def migrate_uploads_command():
+        with db.pool.connection() as conn:
+            moved = blobstore.migrate_uploads(conn, app.config['UPLOAD_FOLDER'])
+        print(f"업로드 파일 {moved}개를 저장소로 옮겼습니다.")
+
+    @app.cli.command('build-assets')
+    def build_assets_command():
+        built = assets.build_assets(app.static_folder)
+        for source, target in sorted(built.items()):
+            print(f"{source} -> {target}")
+        print(f"정적 파일 {len(built)}개를 빌드했습니다.")
+
+    @app.cli.command('db-upgrade')
+    def db_upgrade_command():
+        init_db(app)
+        with db.pool.connection() as conn:
+            print(f"현재 스키마 버전: {migrations.current_version(conn)} / {migrations.LATEST_VERSION}")
+
+    @app.cli.command('check-query-plans')
+    @click.option('--min-rows', default=1000, help="이 행 수 이상인 테이블의 전체 스캔을 실패로 처리")
+    def check_query_plans_command(min_rows):
+        if app.config['DB_BACKEND'] != 'mysql':
+            print("쿼리 실행 계획 검사는 MySQL에서만 지원합니다.")
+            return
+        with db.pool.connection() as conn:
+            failures, allowed, skipped = query_plans.check_query_plans(conn, min_rows)
+        for location, sql in skipped:
+            print(f"건너뜀 {location}: {sql}")
+        for location, sql, table, reason in allowed:
+            print(f"허용된 전체 스캔 {location} ({table}): {reason}")
+        for location, sql, table, rows in failures:
+            print(f"전체 스캔 {location} ({table}, 약 {rows}행): {sql}")
+        if failures:
+            raise SystemExit(1)
+        print("모든 쿼리가 인덱스를 사용합니다.")
+
+    if not preload:
+        start_worker(app)
     return app
 
+def start_worker(app):
+    try:
+        db.pool.fill()
+    except Exception as e:
+        print(f"DB 연결 풀 초기화 오류: {e}")
+    file_gc.sweeper.start()
+    slow_queries.log.start()
+    metrics.start_flusher()
+
+def preload_templates(app):
+    for name in app.jinja_env.list_templates():
+        app.jinja_env.get_template(name)
+
+def warm_caches(app):
+    from blueprints import main
+    try:
+        with app.test_request_context('/'):
+            version = cache.check_version(db.get_db_connection)
+            cache.topic_list_cache.set((version, 1, None, None), main.render_topic_list(1))
+    except Exception as e:
+        print(f"캐시 예열 오류: {e}")
+
 def init_db(app):
-    db_config = {
-        'host': '127.0.0.1',
-        'port': 3306,
-        'user': 'root',
-        'password': os.getenv('DB_PASSWORD'),
-        'db': 'board',
-        'charset': 'utf8mb4'
-    }
-    
+    db_config = load_db_config()
+
     conn = None
     try:
-        server_conn_info = db_config.copy()
-        db_name = server_conn_info.pop('db')
-        conn = pymysql.connect(**server_conn_info)
-        
-        with conn.cursor() as cursor:
-            cursor.execute(f"CREATE DATABASE IF NOT EXISTS {db_name}")
-            conn.select_db(db_name)
-
-        with conn.cursor() as cursor:
-            create_table_sql = """
-            CREATE TABLE IF NOT EXISTS users (
-                id INT PRIMARY KEY AUTO_INCREMENT,
-                user_id VARCHAR(100) NOT NULL UNIQUE,
-                user_ps VARCHAR(255) NOT NULL,
-                user_name VARCHAR(100) NOT NULL,
-                user_school VARCHAR(100),
-                user_mail VARCHAR(100) UNIQUE,
-                profile_image VARCHAR(255)
-            )
-            """
-            cursor.execute(create_table_sql)
-
-        with conn.cursor() as cursor:
-            create_table_sql = """
-            CREATE TABLE IF NOT EXISTS topic (
-                id INT PRIMARY KEY AUTO_INCREMENT,
-                title VARCHAR(255) NOT NULL,
-                body TEXT NOT NULL,
-                post_user_id VARCHAR(100) NOT NULL,
-                post_user_name VARCHAR(100) NOT NULL,
-                is_secret BOOLEAN,
-                secret_key VARCHAR(100)
-            )
-            """
-            cursor.execute(create_table_sql)
-
-        with conn.cursor() as cursor:
-            create_table_sql = """
-            CREATE TABLE IF NOT EXISTS files (
-                id INT PRIMARY KEY AUTO_INCREMENT,
-                topic_id INT NOT NULL,
-                file_name VARCHAR(255) NOT NULL,
-                file_path VARCHAR(255) NOT NULL,
-                FOREIGN KEY (topic_id) REFERENCES topic(id) ON DELETE CASCADE
-            )
-            """
-            cursor.execute(create_table_sql)
+        if app.config['DB_BACKEND'] == 'sqlite':
+            conn = sqlite_db.SQLiteConnection(app.config['SQLITE_PATH'])
+        else:
+            server_conn_info = db_config.copy()
+            db_name = server_conn_info.pop('db')
+            conn = pymysql.connect(**server_conn_info)
+            
+            with conn.cursor() as cursor:
+                cursor.execute(f"CREATE DATABASE IF NOT EXISTS {db_name}")
+                conn.select_db(db_name)
+
+        applied = migrations.upgrade(conn)
+        for version, name in applied:
+            print(f"마이그레이션 {version} ({name}) 적용")
             
         conn.commit()    
         print("데이터베이스 초기화 완료.")
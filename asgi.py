@@ -0,0 +1,235 @@
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.exceptions import HTTPException
+import asyncio
+import sys
+import tempfile
+import threading
+
+import app as board
+from blueprints.async_views import ASYNC_VIEWS
+from flask import request
+from flask.ctx import RequestContext
+from services import aio_db
+from wsgi import app as flask_app
+
+executor = ThreadPoolExecutor(max_workers=flask_app.config['ASGI_SYNC_THREADS'], thread_name_prefix='asgi-wsgi')
+
+SPOOL_SIZE = 1024 * 1024
+QUEUE_SIZE = 8
+
+class ClientDisconnected(Exception):
+    pass
+
+def build_environ(scope, stream):
+    server_name, server_port = scope.get('server') or ('localhost', 80)
+    path = scope['path']
+    root_path = scope.get('root_path', '')
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+    query = scope.get('query_string', b'')
+    raw_path = scope.get('raw_path') or scope['path'].encode('utf-8')
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': root_path.encode('utf-8').decode('latin-1'),
+        'PATH_INFO': path.encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': query.decode('latin-1'),
+        'REQUEST_URI': (raw_path + b'?' + query if query else raw_path).decode('latin-1'),
+        'SERVER_NAME': server_name,
+        'SERVER_PORT': str(server_port),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': (scope.get('client') or ('', 0))[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': stream,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope['headers']:
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            environ[name] = value
+            continue
+        key = 'HTTP_' + name
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+async def read_body(receive, environ, limit):
+    declared = environ.get('CONTENT_LENGTH')
+    if limit is not None and declared and declared.isdigit() and int(declared) > limit:
+        return False
+
+    size = 0
+    more_body = True
+    while more_body:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            raise ClientDisconnected()
+        chunk = message.get('body', b'')
+        more_body = message.get('more_body', False)
+        size += len(chunk)
+        if limit is not None and size > limit:
+            environ['CONTENT_LENGTH'] = str(size)
+            return False
+        if chunk:
+            environ['wsgi.input'].write(chunk)
+    environ['wsgi.input'].seek(0)
+    if size and not declared:
+        environ['CONTENT_LENGTH'] = str(size)
+    return True
+
+def start_message(status, headers):
+    return {
+        'type': 'http.response.start',
+        'status': int(status.split(' ', 1)[0]),
+        'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers],
+    }
+
+async def send_response(send, status, headers, body):
+    await send(start_message(status, headers))
+    await send({'type': 'http.response.body', 'body': body})
+
+def run_wsgi(environ, emit):
+    response = []
+    started = []
+
+    def start_response(status, headers, exc_info=None):
+        if exc_info and started:
+            raise exc_info[1].with_traceback(exc_info[2])
+        response[:] = [status, headers]
+        return write
+
+    def write(data):
+        if not started:
+            started.append(True)
+            emit(('start', *response))
+        if data:
+            emit(('body', data))
+
+    try:
+        app_iter = flask_app(environ, start_response)
+        try:
+            for chunk in app_iter:
+                write(chunk)
+            write(b'')
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+    except ClientDisconnected:
+        pass
+    except Exception as e:
+        print(f"ASGI 응답 처리 오류: {e}")
+        if not started:
+            response[:] = ['500 INTERNAL SERVER ERROR', [('Content-Type', 'text/plain; charset=utf-8')]]
+            emit(('start', *response))
+            emit(('body', '오류가 발생했습니다.'.encode()))
+    finally:
+        emit(('end',))
+
+async def stream_wsgi(environ, send):
+    loop = asyncio.get_running_loop()
+    messages = asyncio.Queue(maxsize=QUEUE_SIZE)
+    abandoned = threading.Event()
+
+    def emit(item):
+        if abandoned.is_set() and item[0] != 'end':
+            raise ClientDisconnected()
+        asyncio.run_coroutine_threadsafe(messages.put(item), loop).result()
+
+    worker = loop.run_in_executor(executor, run_wsgi, environ, emit)
+    item = None
+    try:
+        while True:
+            item = await messages.get()
+            if item[0] == 'end':
+                break
+            if item[0] == 'start':
+                await send(start_message(item[1], item[2]))
+            else:
+                await send({'type': 'http.response.body', 'body': item[1], 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+    except OSError:
+        pass
+    finally:
+        abandoned.set()
+        while item is None or item[0] != 'end':
+            item = await messages.get()
+        await worker
+
+def open_session(req):
+    interface = flask_app.session_interface
+    session = interface.open_session(flask_app, req)
+    if session is None:
+        session = interface.make_null_session(flask_app)
+    return session
+
+async def run_async_view(view, environ):
+    # 세션 저장소 조회/저장은 블로킹 I/O 이므로 이벤트 루프 밖의 스레드에서 처리
+    req = flask_app.request_class(environ)
+    req.json_module = flask_app.json
+    session = await asyncio.to_thread(open_session, req)
+    with RequestContext(flask_app, environ, request=req, session=session):
+        try:
+            try:
+                rv = flask_app.preprocess_request()
+                if rv is None:
+                    rv = await view(**request.view_args)
+            except Exception as e:
+                rv = flask_app.handle_user_exception(e)
+            response = await asyncio.to_thread(flask_app.finalize_request, rv)
+        except Exception as e:
+            response = await asyncio.to_thread(flask_app.handle_exception, e)
+        status, headers, body = response.status, response.headers.to_wsgi_list(), response.get_data()
+
+    middleware = flask_app.wsgi_app
+    if environ['REQUEST_METHOD'] == 'GET' and middleware.applies(environ, status, headers):
+        status, headers, body = middleware.encode(environ, status, headers, body)
+    return status, headers, body
+
+def match_async_view(environ):
+    if environ['REQUEST_METHOD'] != 'GET':
+        return None
+    try:
+        endpoint, _ = flask_app.url_map.bind_to_environ(environ).match()
+    except HTTPException:
+        return None
+    return ASYNC_VIEWS.get(endpoint)
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            try:
+                await asyncio.to_thread(board.start_worker, flask_app)
+                await aio_db.init_pool(flask_app, board.load_db_config())
+                await asyncio.to_thread(board.warm_caches, flask_app)
+            except Exception as e:
+                await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                return
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await aio_db.close_pool()
+            executor.shutdown(wait=False)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        return await lifespan(receive, send)
+    if scope['type'] != 'http':
+        return
+
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE) as spool:
+        environ = build_environ(scope, spool)
+        try:
+            complete = await read_body(receive, environ, flask_app.config['MAX_CONTENT_LENGTH'])
+        except ClientDisconnected:
+            return
+        view = match_async_view(environ) if complete else None
+        if view is not None:
+            status, headers, body = await run_async_view(view, environ)
+            await send_response(send, status, headers, body)
+        else:
+            await stream_wsgi(environ, send)
@@ -0,0 +1,185 @@
+import argparse
+import http.cookiejar
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from cold_start import free_port, first_response
+from mysql_standin import start_standin, stop_standin
+from route_bench import bench_environ, reset_database, seed, PASSWORD
+from search_bench import TERMS
+
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+
+def process_tree(pid):
+    pids = [pid]
+    for tid in os.listdir(f"/proc/{pid}/task"):
+        try:
+            with open(f"/proc/{pid}/task/{tid}/children") as f:
+                children = f.read().split()
+        except OSError:
+            continue
+        for child in children:
+            pids.extend(process_tree(int(child)))
+    return pids
+
+def tree_rss(pid):
+    total = 0
+    for p in process_tree(pid):
+        try:
+            with open(f"/proc/{p}/statm") as f:
+                total += int(f.read().split()[1]) * PAGE_SIZE
+        except OSError:
+            pass
+    return total
+
+def login(base, user):
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+    data = urllib.parse.urlencode({'user_id': f"bench{user}", 'user_ps': PASSWORD}).encode()
+    opener.open(f"{base}/auth/login", data=data, timeout=30).read()
+    return opener
+
+def read_paths(rng, users, topics, pages):
+    choice = rng.random()
+    if choice < 0.35:
+        return f"/?page={rng.randint(1, pages)}"
+    if choice < 0.7:
+        return f"/topic/read/{rng.randint(1, topics)}/"
+    if choice < 0.9:
+        term = urllib.parse.quote(rng.choice(TERMS))
+        return f"/topic/search/?search_name={term}&search_menu={rng.choice(('title', 'content'))}"
+    return f"/user/profile/{urllib.parse.quote(f'유저{rng.randrange(users)}')}"
+
+def drive(base, args, seed_value):
+    counts = {'ok': 0, 'errors': 0}
+    lock = threading.Lock()
+    deadline = time.monotonic() + args.duration
+
+    def client(index):
+        rng = random.Random(seed_value + index)
+        opener = login(base, rng.randrange(args.users))
+        ok = errors = 0
+        while time.monotonic() < deadline:
+            try:
+                with opener.open(base + read_paths(rng, args.users, args.topics, args.pages), timeout=30) as response:
+                    response.read()
+                ok += 1
+            except (urllib.error.URLError, ConnectionError):
+                errors += 1
+        with lock:
+            counts['ok'] += ok
+            counts['errors'] += errors
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        list(executor.map(client, range(args.concurrency)))
+    return counts, time.perf_counter() - started
+
+def run_server(name, command, env, args):
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    process = subprocess.Popen(command(port), cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        first_response(base + '/', time.monotonic() + args.timeout)
+        idle = tree_rss(process.pid)
+        peak = [idle]
+        stop = threading.Event()
+
+        def sample():
+            while not stop.wait(0.2):
+                peak[0] = max(peak[0], tree_rss(process.pid))
+
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+        counts, duration = drive(base, args, args.seed)
+        stop.set()
+        sampler.join()
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+    return {
+        'name': name, 'rps': counts['ok'] / duration, 'errors': counts['errors'],
+        'idle_mb': idle / 2 ** 20, 'peak_mb': peak[0] / 2 ** 20,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="읽기 경로의 동기(gthread) / 비동기(ASGI) 워커 처리량과 메모리 비교")
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=8, help="동기 워커당 스레드 수")
+    parser.add_argument('--concurrency', type=int, default=32, help="동시 클라이언트 수")
+    parser.add_argument('--duration', type=float, default=20)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--topics', type=int, default=20000)
+    parser.add_argument('--pages', type=int, default=50)
+    parser.add_argument('--db', default='choco_board_bench')
+    parser.add_argument('--skip-seed', action='store_true')
+    parser.add_argument('--standin', action='store_true', help="임시 MySQL 서버를 띄워 사용")
+    parser.add_argument('--standin-port', type=int, default=3307)
+    parser.add_argument('--timeout', type=float, default=60)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    if not shutil.which('gunicorn'):
+        sys.exit("gunicorn 이(가) 필요합니다.")
+
+    tmp = tempfile.mkdtemp(prefix='asgi-bench-')
+    standin = start_standin(args.standin_port) if args.standin else None
+    bench_environ(args.db)
+    os.environ.setdefault('MAIL_BACKEND', 'memory')
+    os.environ.setdefault('SESSION_SQLITE_PATH', os.path.join(tmp, 'sessions.sqlite3'))
+    os.environ.setdefault('SECRET_KEY', 'asgi-bench')
+
+    try:
+        import app as board
+        from services import db
+
+        if not args.skip_seed:
+            reset_database(args.db)
+        flask_app = board.create_app(preload=True)
+        board.init_db(flask_app)
+        if not args.skip_seed:
+            with db.pool.connection() as conn:
+                seed(conn, flask_app.config['UPLOAD_FOLDER'], args.users, args.topics, 0, 0,
+                     flask_app.config['PASSWORD_HASH_METHOD'], random.Random(args.seed))
+        db.pool.close()
+
+        env = dict(os.environ)
+        gunicorn = lambda port: ['gunicorn', '-c', 'gunicorn.conf.py', '--workers', str(args.workers),
+                                 '--max-requests', '0', '--bind', f'127.0.0.1:{port}']
+        servers = [(f"sync gthread {args.workers}x{args.threads}", lambda port: gunicorn(port) + ['--threads', str(args.threads)],
+                    dict(env, GUNICORN_APP='wsgi:app', GUNICORN_WORKER_CLASS='gthread'))]
+        try:
+            import uvicorn
+            servers.append((f"asgi uvicorn {args.workers}x1", gunicorn,
+                            dict(env, GUNICORN_APP='asgi:app', GUNICORN_WORKER_CLASS='uvicorn.workers.UvicornWorker')))
+        except ImportError:
+            print("uvicorn 이(가) 설치되어 있지 않아 ASGI 측정을 건너뜁니다.")
+
+        print(f"concurrency {args.concurrency}, {args.duration:.0f}s, backend {flask_app.config['DB_BACKEND']}")
+        print(f"{'server':<26}{'rps':>9}{'err':>6}{'idle MB':>10}{'peak MB':>10}")
+        for name, command, server_env in servers:
+            r = run_server(name, command, server_env, args)
+            print(f"{r['name']:<26}{r['rps']:>9.1f}{r['errors']:>6}{r['idle_mb']:>10.1f}{r['peak_mb']:>10.1f}")
+    finally:
+        if standin:
+            stop_standin(*standin)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+import argparse
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def serve(mode, port):
+    from werkzeug.serving import make_server
+
+    if mode == 'dev':
+        import app as board
+        flask_app = board.create_app()
+        board.init_db(flask_app)
+    else:
+        import wsgi
+        flask_app = wsgi.app
+        print(f"preloaded {time.time()}", flush=True)
+        pid = os.fork()
+        if pid != 0:
+            signal.signal(signal.SIGTERM, lambda *_: os.kill(pid, signal.SIGTERM))
+            os.waitpid(pid, 0)
+            return
+        wsgi.post_fork()
+    make_server('127.0.0.1', port, flask_app, threaded=True).serve_forever()
+
+def first_response(url, deadline):
+    while time.monotonic() < deadline:
+        try:
+            started = time.perf_counter()
+            with urllib.request.urlopen(url, timeout=5) as response:
+                response.read()
+            return time.perf_counter() - started
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.005)
+    raise RuntimeError(f"{url} 이(가) 응답하지 않습니다.")
+
+def measure(command, port, env, timeout):
+    url = f"http://127.0.0.1:{port}/"
+    started = time.monotonic()
+    wall_started = time.time()
+    process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    try:
+        first = first_response(url, started + timeout)
+        ready = time.monotonic() - started
+        second = first_response(url, time.monotonic() + timeout)
+    finally:
+        process.terminate()
+        try:
+            output, _ = process.communicate(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            output, _ = process.communicate()
+
+    preloaded = None
+    for line in output.splitlines():
+        if line.startswith('preloaded '):
+            preloaded = float(line.split()[1]) - wall_started
+    return ready, first, second, preloaded
+
+def main():
+    parser = argparse.ArgumentParser(description="프로세스 시작부터 첫 응답까지의 시간 측정")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--timeout', type=float, default=60)
+    parser.add_argument('--serve', choices=('dev', 'wsgi'), help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port)
+        return
+
+    tmp = tempfile.mkdtemp(prefix='cold-start-')
+    env = dict(os.environ)
+    env.setdefault('DB_BACKEND', 'sqlite')
+    env.setdefault('SQLITE_PATH', os.path.join(tmp, 'board.sqlite3'))
+    env.setdefault('SESSION_SQLITE_PATH', os.path.join(tmp, 'sessions.sqlite3'))
+    env.setdefault('MAIL_BACKEND', 'memory')
+    env.setdefault('SECRET_KEY', 'cold-start')
+
+    commands = {
+        'dev (create_app + init_db)': lambda port: [sys.executable, __file__, '--serve', 'dev', '--port', str(port)],
+        'wsgi (preload + fork)': lambda port: [sys.executable, __file__, '--serve', 'wsgi', '--port', str(port)],
+    }
+    if shutil.which('gunicorn'):
+        commands['gunicorn -c gunicorn.conf.py'] = lambda port: ['gunicorn', '-c', 'gunicorn.conf.py', '--workers', '1',
+                                                                  '--bind', f'127.0.0.1:{port}']
+
+    print(f"{'mode':<30}{'ready ms':>10}{'1st ms':>9}{'2nd ms':>9}{'worker ms':>11}")
+    try:
+        for name, command in commands.items():
+            results = []
+            for _ in range(args.runs):
+                port = free_port()
+                results.append(measure(command(port), port, env, args.timeout))
+            ready, first, second, preloaded = min(results, key=lambda r: r[0])
+            worker = f"{(ready - preloaded) * 1000:>11.1f}" if preloaded is not None else f"{'-':>11}"
+            print(f"{name:<30}{ready * 1000:>10.1f}{first * 1000:>9.1f}{second * 1000:>9.1f}{worker}")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+import argparse
+import json
+import sys
+
+LATENCY_KEYS = ('p50_ms', 'p95_ms', 'p99_ms')
+
+def load(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)['routes']
+
+def compare(base, new, threshold, min_ms):
+    regressions = []
+    rows = []
+    for route in sorted(set(base) | set(new)):
+        if route not in base or route not in new:
+            rows.append((route, 'missing in ' + ('base' if route not in base else 'new'), '', '', ''))
+            continue
+        old, cur = base[route], new[route]
+        for key in LATENCY_KEYS:
+            change = (cur[key] - old[key]) / old[key] if old[key] else 0.0
+            flagged = change > threshold and cur[key] - old[key] > min_ms
+            rows.append((route, key, f"{old[key]:.1f}", f"{cur[key]:.1f}", f"{change:+.0%}" + (' !' if flagged else '')))
+            if flagged:
+                regressions.append((route, key))
+
+        flagged = cur['queries_per_request'] > old['queries_per_request'] + 0.01
+        rows.append((route, 'queries/req', f"{old['queries_per_request']:.2f}", f"{cur['queries_per_request']:.2f}",
+                     '!' if flagged else ''))
+        if flagged:
+            regressions.append((route, 'queries_per_request'))
+
+        if cur['errors'] > old['errors']:
+            rows.append((route, 'errors', str(old['errors']), str(cur['errors']), '!'))
+            regressions.append((route, 'errors'))
+    return rows, regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="두 route_bench 보고서를 비교해 성능 저하를 표시")
+    parser.add_argument('base')
+    parser.add_argument('new')
+    parser.add_argument('--threshold', type=float, default=0.15, help="허용하는 지연 시간 증가율")
+    parser.add_argument('--min-ms', type=float, default=1.0, help="이보다 작은 절대 증가는 무시")
+    args = parser.parse_args()
+
+    rows, regressions = compare(load(args.base), load(args.new), args.threshold, args.min_ms)
+    print(f"{'route':<20}{'metric':<13}{'base':>10}{'new':>10}{'change':>10}")
+    for route, metric, old, cur, change in rows:
+        print(f"{route:<20}{metric:<13}{old:>10}{cur:>10}{change:>10}")
+
+    if regressions:
+        print(f"{len(regressions)} regression(s): " + ', '.join(f"{route} {metric}" for route, metric in regressions))
+        sys.exit(1)
+    print("no regressions")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from werkzeug.test import Client
+from werkzeug.wrappers import Response
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from route_bench import PASSWORD, seed
+
+ROUTES = [
+    ('main.main', '/'),
+    ('main.main p5', '/?page=5'),
+    ('topic.read', '/topic/read/7/'),
+    ('topic.search', '/topic/search/?search_name=초코파이&search_menu=title'),
+    ('user.profile', '/user/profile/유저1'),
+    ('auth.login', '/auth/login'),
+]
+
+def login(wsgi_app):
+    client = Client(wsgi_app, Response)
+    client.post('/auth/login', data={'user_id': 'bench1', 'user_ps': PASSWORD})
+    client.get('/')
+    return client
+
+def cpu_per_request(client, path, headers, requests):
+    started = time.process_time()
+    for _ in range(requests):
+        client.get(path, headers=headers)
+    return (time.process_time() - started) / requests
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML 응답 압축/ETag 미들웨어의 절약 바이트와 응답당 CPU 비용 측정")
+    parser.add_argument('--requests', type=int, default=300)
+    parser.add_argument('--topics', type=int, default=2000)
+    parser.add_argument('--encoding', default='gzip', help="Accept-Encoding 값 (예: gzip, br)")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix='compression-bench-')
+    os.environ.setdefault('DB_BACKEND', 'sqlite')
+    os.environ.setdefault('SQLITE_PATH', os.path.join(tmp, 'board.sqlite3'))
+    os.environ.setdefault('SESSION_BACKEND', 'memory')
+    os.environ.setdefault('MAIL_BACKEND', 'memory')
+    os.environ.setdefault('SECRET_KEY', 'compression-bench')
+
+    import app as board
+    from services import db
+
+    flask_app = board.create_app()
+    board.init_db(flask_app)
+    with db.pool.connection() as conn:
+        seed(conn, flask_app.config['UPLOAD_FOLDER'], 50, args.topics, 0, 0, 'pbkdf2:sha256:1000', random.Random(1))
+
+    middleware = flask_app.wsgi_app
+    plain = login(middleware.app)
+    compressed = login(middleware)
+    accept = {'Accept-Encoding': args.encoding}
+
+    print(f"{'route':<16}{'raw B':>9}{'sent B':>9}{'saved':>8}{'304 B':>7}{'plain us':>10}{'mw us':>9}{'cost us':>9}")
+    total_raw = total_sent = 0
+    for name, path in ROUTES:
+        raw = plain.get(path)
+        sent = compressed.get(path, headers=accept)
+        revalidated = compressed.get(path, headers={**accept, 'If-None-Match': sent.headers.get('ETag', '')})
+        raw_size, sent_size = len(raw.get_data()), len(sent.get_data())
+        total_raw += raw_size
+        total_sent += sent_size
+
+        for client, headers in ((plain, {}), (compressed, accept)):
+            cpu_per_request(client, path, headers, 20)
+        base_cpu = min(cpu_per_request(plain, path, {}, args.requests) for _ in range(3))
+        mw_cpu = min(cpu_per_request(compressed, path, accept, args.requests) for _ in range(3))
+
+        print(f"{name:<16}{raw_size:>9}{sent_size:>9}{1 - sent_size / raw_size:>8.1%}"
+              f"{len(revalidated.get_data()) if revalidated.status_code == 304 else -1:>7}"
+              f"{base_cpu * 1e6:>10.1f}{mw_cpu * 1e6:>9.1f}{(mw_cpu - base_cpu) * 1e6:>9.1f}")
+
+    print(f"total {total_raw} B -> {total_sent} B ({1 - total_sent / total_raw:.1%} saved, Accept-Encoding: {args.encoding})")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+import argparse
+import hashlib
+import os
+import random
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from route_bench import PASSWORD, bench_environ, reset_database, seed
+
+def login(flask_app):
+    client = flask_app.test_client()
+    client.post('/auth/login', data={'user_id': 'bench0', 'user_ps': PASSWORD})
+    return client
+
+def main():
+    parser = argparse.ArgumentParser(description="큰 첨부파일을 여러 Range 요청으로 병렬 다운로드하고 Range / If-Range / 304 동작 검증")
+    parser.add_argument('--size-mb', type=float, default=30)
+    parser.add_argument('--parts', type=int, default=8)
+    parser.add_argument('--db', default='choco_board_ranges')
+    args = parser.parse_args()
+
+    os.environ.setdefault('DB_BACKEND', 'sqlite')
+    os.environ.setdefault('SESSION_BACKEND', 'memory')
+    os.environ.setdefault('MAIL_BACKEND', 'memory')
+    os.environ.setdefault('SECRET_KEY', 'download-ranges')
+    bench_environ(args.db)
+
+    import app as board
+    from services import db
+
+    reset_database(args.db)
+    flask_app = board.create_app()
+    board.init_db(flask_app)
+    try:
+        size = int(args.size_mb * 1024 * 1024)
+        with db.pool.connection() as conn:
+            seed(conn, flask_app.config['UPLOAD_FOLDER'], 1, 1, 1, 1.0, 'pbkdf2:sha256:1000', random.Random(1),
+                 attachment_size=size)
+        url = '/topic/download/1'
+
+        head = login(flask_app).get(url, headers={'Range': 'bytes=0-0'})
+        assert head.status_code == 206, f"Range 요청이 지원되지 않습니다: {head.status_code}"
+        total = int(head.headers['Content-Range'].rsplit('/', 1)[1])
+        etag = head.headers['ETag']
+        assert total == size, f"길이 불일치: {total} != {size}"
+
+        part_size = -(-total // args.parts)
+        ranges = [(start, min(start + part_size, total) - 1) for start in range(0, total, part_size)]
+        clients = [login(flask_app) for _ in ranges]
+
+        def fetch(index):
+            start, end = ranges[index]
+            response = clients[index].get(url, headers={'Range': f"bytes={start}-{end}", 'If-Range': etag})
+            return response.status_code, response.headers.get('Content-Range'), response.get_data()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            results = list(executor.map(fetch, range(len(ranges))))
+        elapsed = time.perf_counter() - started
+
+        for (start, end), (status, content_range, _) in zip(ranges, results):
+            assert status == 206, f"Range 응답 코드: {status}"
+            assert content_range == f"bytes {start}-{end}/{total}", f"Content-Range 불일치: {content_range}"
+        body = b''.join(data for _, _, data in results)
+        assert len(body) == total, f"길이 불일치: {len(body)} != {total}"
+        assert hashlib.sha256(body).hexdigest() == etag.strip('"'), "재조립한 파일의 SHA-256이 ETag와 다릅니다."
+
+        client = clients[0]
+        stale = client.get(url, headers={'Range': 'bytes=0-1023', 'If-Range': '"stale"'})
+        assert stale.status_code == 200 and len(stale.get_data()) == total, f"오래된 If-Range 응답: {stale.status_code}"
+
+        revalidated = client.get(url, headers={'If-None-Match': etag})
+        assert revalidated.status_code == 304, f"If-None-Match 응답 코드: {revalidated.status_code}"
+        assert revalidated.headers.get('ETag') == etag, "304 응답의 ETag가 다릅니다."
+
+        print(f"{total} bytes in {len(ranges)} ranges, {elapsed:.2f}s ({total / elapsed / 1024 / 1024:.1f} MiB/s), "
+              f"sha256 ok, If-Range ok, 304 ok")
+    finally:
+        db.pool.close()
+        shutil.rmtree(flask_app.config['UPLOAD_FOLDER'], ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+import pymysql
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import load_db_config
+from services import listing
+from search_bench import seed
+
+QUERIES = {
+    'select *': "SELECT * FROM topic ORDER BY id DESC LIMIT %s OFFSET %s",
+    'list columns': f"SELECT {listing.LIST_COLUMNS} FROM topic ORDER BY id DESC LIMIT %s OFFSET %s",
+}
+
+class CountingReader:
+    def __init__(self, rfile):
+        self.rfile = rfile
+        self.bytes_read = 0
+
+    def read(self, n):
+        data = self.rfile.read(n)
+        self.bytes_read += len(data)
+        return data
+
+    def __getattr__(self, name):
+        return getattr(self.rfile, name)
+
+def run(conn, sql, pages, per_page):
+    reader = CountingReader(conn._rfile)
+    conn._rfile = reader
+    rows = 0
+    started = time.perf_counter()
+    try:
+        for page in range(pages):
+            with conn.cursor() as cursor:
+                cursor.execute(sql, (per_page, page * per_page))
+                rows += len(cursor.fetchall())
+    finally:
+        conn._rfile = reader.rfile
+    return rows, reader.bytes_read, time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description="목록 조회: SELECT * 와 목록 전용 컬럼 비교")
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--pages', type=int, default=200)
+    parser.add_argument('--per-page', type=int, default=10)
+    parser.add_argument('--db', default='board_bench')
+    parser.add_argument('--skip-seed', action='store_true')
+    args = parser.parse_args()
+
+    db_config = load_db_config()
+    server_config = {k: v for k, v in db_config.items() if k != 'db'}
+    conn = pymysql.connect(**server_config, cursorclass=pymysql.cursors.DictCursor)
+    with conn.cursor() as cursor:
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS {args.db}")
+    conn.select_db(args.db)
+
+    if not args.skip_seed:
+        seed(conn, args.rows, random.Random(42))
+    with conn.cursor() as cursor:
+        listing.ensure_list_index(cursor)
+    conn.commit()
+
+    print(f"{'query':<14}{'rows':>8}{'bytes':>14}{'bytes/row':>12}{'rows/s':>12}")
+    for name, sql in QUERIES.items():
+        rows, bytes_read, elapsed = run(conn, sql, args.pages, args.per_page)
+        print(f"{name:<14}{rows:>8}{bytes_read:>14}{bytes_read / max(rows, 1):>12.0f}{rows / elapsed:>12.0f}")
+
+    conn.close()
+
+if __name__ == '__main__':
+    main()
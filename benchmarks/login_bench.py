@@ -0,0 +1,73 @@
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.hashing import PasswordHasher, HasherBusy
+
+def run(verify, logins, concurrency, page_view_interval=0.01):
+    ok = busy = 0
+    lock = threading.Lock()
+    page_views = []
+    stop = threading.Event()
+
+    def page_viewer():
+        while not stop.is_set():
+            started = time.perf_counter()
+            sum(range(20000))
+            page_views.append(time.perf_counter() - started)
+            time.sleep(page_view_interval)
+
+    def login(_):
+        nonlocal ok, busy
+        try:
+            verify()
+            with lock:
+                ok += 1
+        except HasherBusy:
+            with lock:
+                busy += 1
+
+    viewer = threading.Thread(target=page_viewer)
+    viewer.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(login, range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    viewer.join()
+
+    page_views.sort()
+    p95 = page_views[int(len(page_views) * 0.95)] if page_views else 0
+    return ok, busy, elapsed, p95
+
+def main():
+    parser = argparse.ArgumentParser(description="동시 로그인 처리량: 인라인 해싱과 해싱 프로세스 풀 비교")
+    parser.add_argument('--logins', type=int, default=64)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--max-pending', type=int, default=8)
+    parser.add_argument('--method', default='scrypt:32768:8:1')
+    args = parser.parse_args()
+
+    pwhash = generate_password_hash('password', method=args.method)
+    hasher = PasswordHasher(args.method, max_workers=args.workers, max_pending=args.max_pending, timeout=30)
+    hasher.verify(pwhash, 'password')
+
+    cases = {
+        'inline': lambda: check_password_hash(pwhash, 'password'),
+        'process pool': lambda: hasher.verify(pwhash, 'password'),
+    }
+    print(f"{'mode':<14}{'ok':>6}{'busy':>6}{'logins/s':>10}{'page p95 ms':>13}")
+    for name, verify in cases.items():
+        ok, busy, elapsed, p95 = run(verify, args.logins, args.concurrency)
+        print(f"{name:<14}{ok:>6}{busy:>6}{ok / elapsed:>10.1f}{p95 * 1000:>13.2f}")
+
+if __name__ == '__main__':
+    main()
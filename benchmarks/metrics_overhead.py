@@ -0,0 +1,64 @@
+import argparse
+import os
+import sys
+import time
+
+from flask import Flask, render_template
+from jinja2 import DictLoader
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import metrics
+
+def make_app(instrumented):
+    app = Flask(__name__)
+    app.jinja_loader = DictLoader({'hello.html': "<p>{{ name }}</p>"})
+
+    @app.route('/hello')
+    def hello():
+        return render_template('hello.html', name='초코파이')
+
+    if instrumented:
+        metrics.init_metrics(app)
+    return app
+
+def per_request(apps, requests, rounds=7):
+    clients = [app.test_client() for app in apps]
+    for client in clients:
+        for _ in range(200):
+            client.get('/hello')
+    best = [None] * len(clients)
+    for _ in range(rounds):
+        for i, client in enumerate(clients):
+            started = time.perf_counter()
+            for _ in range(requests):
+                client.get('/hello')
+            elapsed = (time.perf_counter() - started) / requests
+            best[i] = elapsed if best[i] is None else min(best[i], elapsed)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="요청 계측(/metrics)의 요청당 오버헤드 측정")
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--max-overhead-us', type=float, default=50.0)
+    args = parser.parse_args()
+
+    plain, instrumented = per_request([make_app(False), make_app(True)], args.requests)
+    overhead = (instrumented - plain) * 1e6
+
+    registry = metrics.MetricsRegistry()
+    started = time.perf_counter()
+    for i in range(args.requests):
+        registry.observe_request('topic.read', 200, 0.012, 2, 0.001, 0.0005, 0)
+    observe = (time.perf_counter() - started) / args.requests * 1e6
+
+    print(f"plain        {plain * 1e6:8.1f} us/request")
+    print(f"instrumented {instrumented * 1e6:8.1f} us/request")
+    print(f"overhead     {overhead:8.1f} us/request ({overhead / (plain * 1e6):.1%})")
+    print(f"observe_request alone {observe:.2f} us")
+    if overhead > args.max_overhead_us:
+        print(f"overhead exceeds {args.max_overhead_us} us")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
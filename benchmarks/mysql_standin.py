@@ -0,0 +1,46 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+import pymysql
+
+def start_standin(port=3307, timeout=60):
+    mysqld = shutil.which('mysqld')
+    if mysqld is None:
+        raise SystemExit("mysqld를 찾을 수 없습니다. MySQL 8 서버를 설치하거나 --standin 없이 실행하세요.")
+
+    datadir = tempfile.mkdtemp(prefix='board-bench-mysql-')
+    subprocess.run(
+        [mysqld, '--no-defaults', '--initialize-insecure', f'--datadir={datadir}/data'],
+        check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    process = subprocess.Popen(
+        [mysqld, '--no-defaults', f'--datadir={datadir}/data', f'--port={port}',
+         f'--socket={datadir}/mysql.sock', '--mysqlx=OFF', '--bind-address=127.0.0.1',
+         '--skip-log-bin', '--innodb-flush-log-at-trx-commit=2'],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            pymysql.connect(host='127.0.0.1', port=port, user='root', password='').close()
+            break
+        except pymysql.err.OperationalError:
+            if process.poll() is not None or time.monotonic() > deadline:
+                stop_standin(process, datadir)
+                raise SystemExit("임시 MySQL 서버를 시작하지 못했습니다.")
+            time.sleep(0.5)
+
+    os.environ.update({'DB_HOST': '127.0.0.1', 'DB_PORT': str(port), 'DB_USER': 'root', 'DB_PASSWORD': ''})
+    return process, datadir
+
+def stop_standin(process, datadir):
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+    shutil.rmtree(datadir, ignore_errors=True)
@@ -0,0 +1,213 @@
+import argparse
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pymysql
+from werkzeug.security import generate_password_hash
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_bench import random_text, TERMS, MODES
+from mysql_standin import start_standin, stop_standin
+
+PASSWORD = 'bench-password'
+ERROR_MARKER = '오류가 발생했습니다'.encode()
+PERCENTILES = (50, 95, 99)
+
+def bench_environ(db_name):
+    base = os.path.join(tempfile.gettempdir(), db_name)
+    os.environ['DB_NAME'] = db_name
+    os.environ['UPLOAD_FOLDER'] = base + '-uploads'
+    if os.getenv('DB_BACKEND', 'mysql') == 'sqlite':
+        os.environ['SQLITE_PATH'] = base + '.sqlite3'
+
+def reset_database(db_name):
+    import app as board
+
+    shutil.rmtree(os.path.join(tempfile.gettempdir(), db_name + '-uploads'), ignore_errors=True)
+    if os.getenv('DB_BACKEND', 'mysql') == 'sqlite':
+        path = os.path.join(tempfile.gettempdir(), db_name + '.sqlite3')
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+        return
+
+    server_config = {k: v for k, v in board.load_db_config().items() if k != 'db'}
+    conn = pymysql.connect(**server_config)
+    with conn.cursor() as cursor:
+        cursor.execute(f"DROP DATABASE IF EXISTS {db_name}")
+        cursor.execute(f"CREATE DATABASE {db_name}")
+    conn.close()
+
+def seed(conn, upload_folder, users, topics, attachments, attachment_ratio, hash_method, rng, attachment_size=None):
+    from services import blobstore
+    from services.repos import FileRepo, TopicRepo, UserRepo
+
+    pwhash = generate_password_hash(PASSWORD, method=hash_method)
+    UserRepo(conn).create_many(
+        (f"bench{i}", pwhash, f"유저{i}", f"학교{i % 50}", f"bench{i}@example.com") for i in range(users)
+    )
+    TopicRepo(conn).create_many(
+        (random_text(rng, 4), random_text(rng, 120), f"bench{i % users}", f"유저{i % users}", 0, None)
+        for i in range(topics)
+    )
+
+    blobs = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(attachments):
+            path = os.path.join(tmp, f"bench{i}.txt")
+            with open(path, 'wb') as f:
+                f.write(rng.randbytes(attachment_size or rng.randint(16 * 1024, 256 * 1024)))
+            blobs.append((f"bench{i}.txt", blobstore.ingest_file(upload_folder, path)))
+    if blobs:
+        FileRepo(conn).add_many(
+            (topic_id, *rng.choice(blobs)) for topic_id in range(1, topics + 1) if rng.random() < attachment_ratio
+        )
+    conn.commit()
+
+class Recorder:
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.samples = {}
+
+    def on_query(self, query, args, elapsed):
+        if getattr(self._local, 'queries', None) is not None:
+            self._local.queries += 1
+
+    def request(self, route, call):
+        self._local.queries = 0
+        started = time.perf_counter()
+        response = call()
+        elapsed = time.perf_counter() - started
+        queries, self._local.queries = self._local.queries, None
+        failed = response.status_code >= 500 or ERROR_MARKER in response.get_data()
+        with self._lock:
+            self.samples.setdefault(route, []).append((elapsed, queries, failed))
+        return response
+
+def run_session(client, recorder, rng, users, topics, pages):
+    user = rng.randrange(users)
+    recorder.request('auth.login', lambda: client.post('/auth/login', data={'user_id': f"bench{user}", 'user_ps': PASSWORD}))
+
+    for page in range(1, pages + 1):
+        recorder.request('main.main', lambda: client.get(f"/?page={page}"))
+    for _ in range(3):
+        topic_id = rng.randint(1, topics)
+        recorder.request('topic.read', lambda: client.get(f"/topic/read/{topic_id}/"))
+
+    term, mode = rng.choice(TERMS), rng.choice(MODES)
+    recorder.request('topic.search', lambda: client.get('/topic/search/', query_string={'search_name': term, 'search_menu': mode}))
+
+    data = {'title': random_text(rng, 4), 'body': random_text(rng, 60)}
+    if rng.random() < 0.2:
+        data['file'] = (io.BytesIO(rng.randbytes(32 * 1024)), 'bench.txt', 'text/plain')
+    recorder.request('topic.create', lambda: client.post('/topic/create/', data=data, content_type='multipart/form-data'))
+
+    recorder.request('user.profile', lambda: client.get(f"/user/profile/유저{user}"))
+    recorder.request('auth.find_account', lambda: client.post('/auth/find_account', data={'user_name': f"유저{user}", 'user_school': f"학교{user % 50}"}))
+    recorder.request('auth.logout', lambda: client.get('/auth/logout'))
+
+def percentile(values, pct):
+    index = min(len(values) - 1, max(0, int(round(pct / 100 * len(values))) - 1))
+    return values[index]
+
+def summarize(samples, duration):
+    routes = {}
+    for route, rows in sorted(samples.items()):
+        latencies = sorted(elapsed for elapsed, _, _ in rows)
+        summary = {
+            'count': len(rows),
+            'errors': sum(1 for _, _, failed in rows if failed),
+            'mean_ms': sum(latencies) / len(latencies) * 1000,
+            'throughput_rps': len(rows) / duration,
+            'queries_per_request': sum(queries for _, queries, _ in rows) / len(rows),
+        }
+        for pct in PERCENTILES:
+            summary[f"p{pct}_ms"] = percentile(latencies, pct) * 1000
+        routes[route] = summary
+    return routes
+
+def main():
+    parser = argparse.ArgumentParser(description="라우트별 지연 시간/처리량/쿼리 수 벤치마크")
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--topics', type=int, default=50000)
+    parser.add_argument('--attachments', type=int, default=50)
+    parser.add_argument('--attachment-ratio', type=float, default=0.1)
+    parser.add_argument('--sessions', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--pages', type=int, default=3)
+    parser.add_argument('--db', default='board_bench')
+    parser.add_argument('--skip-seed', action='store_true')
+    parser.add_argument('--standin', action='store_true', help="임시 MySQL 서버를 띄워 사용")
+    parser.add_argument('--standin-port', type=int, default=3307)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', default='route_report.json')
+    args = parser.parse_args()
+
+    standin = start_standin(args.standin_port) if args.standin else None
+    bench_environ(args.db)
+    os.environ.setdefault('MAIL_BACKEND', 'memory')
+    os.environ.setdefault('SESSION_BACKEND', 'memory')
+
+    try:
+        import app as board
+        from services import db
+
+        if not args.skip_seed:
+            reset_database(args.db)
+        flask_app = board.create_app()
+        board.init_db(flask_app)
+
+        rng = random.Random(args.seed)
+        if not args.skip_seed:
+            started = time.perf_counter()
+            with db.pool.connection() as conn:
+                seed(conn, flask_app.config['UPLOAD_FOLDER'], args.users, args.topics, args.attachments,
+                     args.attachment_ratio, flask_app.config['PASSWORD_HASH_METHOD'], rng)
+            print(f"seeded {args.users} users, {args.topics} topics in {time.perf_counter() - started:.1f}s")
+
+        recorder = Recorder()
+        db.add_query_listener(recorder.on_query)
+        session_seeds = [rng.randrange(2 ** 32) for _ in range(args.sessions)]
+
+        def session(session_seed):
+            run_session(flask_app.test_client(), recorder, random.Random(session_seed),
+                        args.users, args.topics, args.pages)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            list(executor.map(session, session_seeds))
+        duration = time.perf_counter() - started
+        db.remove_query_listener(recorder.on_query)
+    finally:
+        if standin:
+            stop_standin(*standin)
+
+    report = {
+        'meta': {
+            'backend': flask_app.config['DB_BACKEND'], 'users': args.users, 'topics': args.topics, 'attachments': args.attachments,
+            'sessions': args.sessions, 'concurrency': args.concurrency,
+            'duration_s': duration, 'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'routes': summarize(recorder.samples, duration),
+    }
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"{'route':<20}{'count':>7}{'err':>5}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'rps':>8}{'q/req':>7}")
+    for route, s in report['routes'].items():
+        print(f"{route:<20}{s['count']:>7}{s['errors']:>5}{s['p50_ms']:>9.1f}{s['p95_ms']:>9.1f}"
+              f"{s['p99_ms']:>9.1f}{s['throughput_rps']:>8.1f}{s['queries_per_request']:>7.1f}")
+    print(f"report written to {args.out}")
+
+if __name__ == '__main__':
+    main()
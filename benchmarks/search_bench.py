@@ -0,0 +1,97 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+import pymysql
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import load_db_config
+from services import search
+
+SYLLABLES = "초코파이맛있다과자우유학교급식친구선생님오늘내일주말간식가게편의점사랑정말진짜"
+TERMS = ['초코파이', '급식', '편의점 간식', '선생님', '우유']
+MODES = ('title', 'body', 'title_body')
+
+def random_text(rng, words):
+    return ' '.join(
+        ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        for _ in range(words)
+    )
+
+def seed(conn, rows, rng):
+    with conn.cursor() as cursor:
+        cursor.execute("DROP TABLE IF EXISTS topic")
+        cursor.execute("""
+            CREATE TABLE topic (
+                id INT PRIMARY KEY AUTO_INCREMENT,
+                title VARCHAR(255) NOT NULL,
+                body TEXT NOT NULL,
+                post_user_id VARCHAR(100) NOT NULL,
+                post_user_name VARCHAR(100) NOT NULL,
+                is_secret BOOLEAN,
+                secret_key VARCHAR(100)
+            )
+        """)
+        sql = "INSERT INTO topic (title, body, post_user_id, post_user_name, is_secret) VALUES (%s, %s, %s, %s, 0)"
+        batch = []
+        for i in range(rows):
+            batch.append((random_text(rng, 4), random_text(rng, 120), f"user{i % 500}", f"유저{i % 500}"))
+            if len(batch) == 1000:
+                cursor.executemany(sql, batch)
+                batch = []
+        if batch:
+            cursor.executemany(sql, batch)
+    conn.commit()
+
+def timed(conn, sql, params, repeat):
+    best = None
+    count = 0
+    for _ in range(repeat):
+        with conn.cursor() as cursor:
+            started = time.perf_counter()
+            cursor.execute(sql, params)
+            count = len(cursor.fetchall())
+            elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, count
+
+def main():
+    parser = argparse.ArgumentParser(description="LIKE 검색과 FULLTEXT ngram 검색 비교")
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--db', default='board_bench')
+    parser.add_argument('--skip-seed', action='store_true')
+    args = parser.parse_args()
+
+    db_config = load_db_config()
+    db_config['db'] = args.db
+    server_config = {k: v for k, v in db_config.items() if k != 'db'}
+    conn = pymysql.connect(**server_config, cursorclass=pymysql.cursors.DictCursor)
+    with conn.cursor() as cursor:
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS {args.db}")
+    conn.select_db(args.db)
+
+    if not args.skip_seed:
+        started = time.perf_counter()
+        seed(conn, args.rows, random.Random(42))
+        print(f"seeded {args.rows} topics in {time.perf_counter() - started:.1f}s")
+        started = time.perf_counter()
+        with conn.cursor() as cursor:
+            search.ensure_fulltext_indexes(cursor)
+        print(f"built fulltext indexes in {time.perf_counter() - started:.1f}s")
+
+    print(f"{'mode':<12}{'term':<14}{'like ms':>10}{'rows':>8}{'fulltext ms':>14}{'rows':>8}{'speedup':>10}")
+    for mode in MODES:
+        for term in TERMS:
+            like_time, like_rows = timed(conn, *search.build_like_query(mode, term), args.repeat)
+            ft_time, ft_rows = timed(conn, *search.build_fulltext_query(mode, term), args.repeat)
+            print(f"{mode:<12}{term:<14}{like_time * 1000:>10.1f}{like_rows:>8}"
+                  f"{ft_time * 1000:>14.1f}{ft_rows:>8}{like_time / ft_time:>9.1f}x")
+
+    conn.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+from flask import request, render_template, redirect, url_for, flash, session
+import asyncio
+
+from blueprints import main as main_views, topic as topic_views
+from services import aio_db, cache, db
+from services.aio_repos import AsyncTopicRepo, AsyncUserRepo
+from services.repos import TopicRepo
+from services.search import SEARCH_PER_PAGE
+
+def sync_cache_versions():
+    with db.pool.connection() as conn:
+        cache.sync_versions(lambda: conn)
+
+async def current_cache_version():
+    if cache.version_due():
+        await asyncio.to_thread(sync_cache_versions)
+    return cache.version
+
+async def current_topic_version():
+    if cache.version_due():
+        await asyncio.to_thread(sync_cache_versions)
+    return cache.topic_version
+
+def reconcile_topic_count():
+    with db.pool.connection() as conn:
+        return TopicRepo(conn).reconcile_count()
+
+async def main():
+    page = max(request.args.get('page', 1, type=int), 1)
+    before = request.args.get('before', type=int)
+    after = request.args.get('after', type=int)
+
+    cache_key = (await current_cache_version(), page, before, after)
+    topic_list = cache.topic_list_cache.get(cache_key)
+    if topic_list is None:
+        try:
+            async with aio_db.pool.acquire() as conn:
+                topics = AsyncTopicRepo(conn)
+                total_posts = await topics.count()
+                if total_posts is None:
+                    total_posts = await asyncio.to_thread(reconcile_topic_count)
+                page_result = await topics.page(page, main_views.POST_PER_PAGE, before, after)
+            topic_list = main_views.topic_list_markup(page, total_posts, *page_result)
+            cache.topic_list_cache.set(cache_key, topic_list)
+        except Exception as e:
+            print(f"데이터베이스 조회 오류: {e}")
+            topic_list = main_views.empty_topic_list()
+
+    return render_template('base.html', topic_list=topic_list)
+
+async def read(id):
+    if 'logged_in' not in session:
+        flash('로그인이 필요한 서비스입니다.')
+        return redirect(url_for('auth.login'))
+
+    try:
+        key = (await current_topic_version(), id)
+        cached = cache.topic_cache.get(key)
+        if cached is None:
+            async with aio_db.pool.acquire() as conn:
+                row = await AsyncTopicRepo(conn).get_with_file(id)
+            cached = topic_views.cache_topic_row(key, row)
+        topic, file_info = cached
+
+        if topic is None:
+            flash('존재하지 않는 게시글입니다.')
+            return redirect(url_for('main.main'))
+
+        if not topic_views.has_topic_access(topic):
+            return render_template('read_secret.html', topic=topic)
+
+        return render_template('read.html', topic=topic, file=file_info)
+
+    except Exception as e:
+        print(f"데이터베이스 조회 오류: {e}")
+        flash('오류가 발생했습니다.')
+        return redirect(url_for('main.main'))
+
+async def search():
+    search_name = request.args.get('search_name')
+    search_type = request.args.get('search_menu')
+
+    if not search_name or not search_name.strip():
+        return render_template('search.html', topics=[])
+
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', SEARCH_PER_PAGE, type=int)
+
+    try:
+        async with aio_db.pool.acquire() as conn:
+            result = await AsyncTopicRepo(conn).search(search_type, search_name, page, per_page)
+        if result is None:
+            return render_template('search.html', error="잘못된 검색 유형입니다.")
+        return render_template('search.html', **topic_views.search_context(search_name, search_type, result))
+
+    except Exception as e:
+        print(f"데이터베이스 조회 오류: {e}")
+        return render_template('search.html', error=f"데이터베이스 오류: {e}")
+
+async def profile(user_name):
+    if 'logged_in' not in session:
+        flash('로그인이 필요한 서비스입니다.')
+        return redirect(url_for('auth.login'))
+
+    try:
+        async with aio_db.pool.acquire() as conn:
+            user_info = await AsyncUserRepo(conn).get_by_name(user_name)
+
+        if not user_info:
+            flash('존재하지 않는 사용자입니다.')
+            return redirect(url_for('main.main'))
+
+        return render_template('profile.html', user=user_info)
+
+    except Exception as e:
+        print(f"데이터베이스 조회 오류: {e}")
+        flash('오류가 발생했습니다.')
+        return redirect(url_for('main.main'))
+
+ASYNC_VIEWS = {
+    'main.main': main,
+    'topic.read': read,
+    'topic.search': search,
+    'user.profile': profile,
+}
@@ -1,29 +1,27 @@
 from flask import Blueprint, request, render_template, redirect, url_for, flash, session
-from werkzeug.security import generate_password_hash, check_password_hash
-from flask_mail import Message
-import pymysql
+from services.db import get_db_connection
+from services.repos import UserRepo
+from services.mailer import MailQueueFull
+from services.hashing import HasherBusy
 import os
 
 auth_bp = Blueprint('auth', __name__)
 
-db_config = None
 mail = None
-
-def get_db_connection():
-    return pymysql.connect(
-        host=db_config['host'],
-        port=db_config['port'],
-        user=db_config['user'],
-        password=db_config['password'],
-        db=db_config['db'],
-        charset=db_config['charset'],
-        cursorclass=pymysql.cursors.DictCursor
-    )
+hasher = None
 
 def generate_code():
     import random
     return str(random.randint(100000, 999999))
 
+def rehash_password(conn, user_id, user_ps):
+    try:
+        hashed_ps = hasher.hash(user_ps)
+        UserRepo(conn).set_password(user_id, hashed_ps)
+        conn.commit()
+    except Exception as e:
+        print(f"비밀번호 재해싱 오류: {e}")
+
 @auth_bp.route("/register", methods=['GET', 'POST'])
 def register():
     conn = None
@@ -42,32 +40,27 @@ def register():
                 flash('아이디와 패스워드에 공백이 포함되면 안됩니다.')
                 return redirect(url_for('auth.register'))
 
-            hashed_ps = generate_password_hash(user_ps)
+            hashed_ps = hasher.hash(user_ps)
             conn = get_db_connection()
+            users = UserRepo(conn)
+
+            if users.get(user_id):
+                flash('이미 존재하는 ID입니다!')
+                return redirect(url_for('auth.register'))
+            else:
+                users.create(user_id, hashed_ps, user_name, user_school, user_mail)
+                conn.commit()
+                flash('회원가입 성공! 로그인을 진행해주세요')
+                return redirect(url_for('main.main'))
 
-            with conn.cursor() as cursor:
-                sql = "SELECT * FROM users WHERE user_id = %s"
-                cursor.execute(sql, (user_id,))
-                current_user = cursor.fetchone()
-
-                if current_user:
-                    flash('이미 존재하는 ID입니다!')
-                    return redirect(url_for('auth.register'))
-                else:
-                    sql = "INSERT INTO users (user_id, user_ps, user_name, user_school, user_mail) VALUES (%s, %s, %s, %s, %s)"
-                    cursor.execute(sql, (user_id, hashed_ps, user_name, user_school, user_mail))
-                    conn.commit()
-                    flash('회원가입 성공! 로그인을 진행해주세요')
-                    return redirect(url_for('main.main'))
+    except HasherBusy:
+        flash('요청이 많습니다. 잠시 후 다시 시도해주세요.')
+        return redirect(url_for('auth.register'))
 
     except Exception as e:
         print(f"데이터베이스 조회 오류: {e}")
         return "오류가 발생했습니다. <a href='/'>돌아가기</a>"
 
-    finally:
-        if conn:
-            conn.close()
-
 @auth_bp.route('/login', methods=['GET', 'POST'])
 def login():
     conn = None
@@ -80,16 +73,16 @@ def login():
 
         try:
             conn = get_db_connection()
-            with conn.cursor() as cursor:
-                sql = "SELECT * FROM users WHERE user_id = %s"
-                cursor.execute(sql, (user_id,))
-                current_user_info = cursor.fetchone()
+            current_user_info = UserRepo(conn).get(user_id)
 
             if current_user_info is None:
                 flash("존재하지 않는 사용자입니다.")
                 return redirect(url_for('auth.login'))
 
-            if check_password_hash(current_user_info['user_ps'], user_ps):
+            if hasher.verify(current_user_info['user_ps'], user_ps):
+                if hasher.needs_rehash(current_user_info['user_ps']):
+                    rehash_password(conn, current_user_info['user_id'], user_ps)
+
                 session.clear()
                 session['logged_in'] = True
                 session['user_id'] = current_user_info['user_id']
@@ -100,14 +93,14 @@ def login():
                 flash('아이디 혹은 비밀번호가 올바르지 않습니다.')
                 return redirect(url_for('auth.login'))
 
+        except HasherBusy:
+            flash('요청이 많습니다. 잠시 후 다시 시도해주세요.')
+            return redirect(url_for('auth.login'))
+
         except Exception as e:
             print(f"데이터베이스 조회 오류: {e}")
             return "오류가 발생했습니다. <a href='/'>돌아가기</a>"
 
-        finally:
-            if conn:
-                conn.close()
-
 @auth_bp.route('/logout')
 def logout():
     if 'logged_in' in session:
@@ -125,26 +118,19 @@ def find_account():
         user_name = request.form['user_name']
         user_school = request.form['user_school']
         conn = get_db_connection()
-        with conn.cursor() as cursor:
-            sql = "SELECT * FROM users WHERE user_name = %s AND user_school = %s"
-            cursor.execute(sql, (user_name, user_school,))
-            user_info = cursor.fetchone()
-
-            if user_info is None:
-                flash('존재하지 않는 사용자 정보입니다.')
-                return redirect(url_for('auth.find_account'))
-            else:
-                return render_template('find_account.html', user=user_info)
+        user_info = UserRepo(conn).find(user_name, user_school)
+
+        if user_info is None:
+            flash('존재하지 않는 사용자 정보입니다.')
+            return redirect(url_for('auth.find_account'))
+        else:
+            return render_template('find_account.html', user=user_info)
 
     except Exception as e:
         print(f"데이터베이스 조회 오류: {e}")
         flash('사용자 정보를 찾는 중 오류가 발생했습니다.')
         return redirect(url_for('main.main'))
 
-    finally:
-        if conn:
-            conn.close()
-
 @auth_bp.route('/reset_password', methods=['GET', 'POST'])
 def reset_password():
     conn = None
@@ -157,36 +143,32 @@ def reset_password():
         user_email = request.form['mail']
 
         conn = get_db_connection()
-        with conn.cursor() as cursor:
-            sql = "SELECT * FROM users WHERE user_id=%s AND user_name=%s AND user_mail=%s"
-            cursor.execute(sql, (user_id, user_name, user_email,))
-            user_info = cursor.fetchone()
-
-            if user_info is None:
-                flash('존재하지 않는 사용자입니다.')
-                return redirect(url_for('auth.reset_password'))
-            else:
-                verification_code = generate_code()
-                session['verification_code'] = verification_code
-                session['mail'] = user_email
+        user_info = UserRepo(conn).find_for_reset(user_id, user_name, user_email)
 
-                msg = Message(
+        if user_info is None:
+            flash('존재하지 않는 사용자입니다.')
+            return redirect(url_for('auth.reset_password'))
+        else:
+            verification_code = generate_code()
+            try:
+                mail.send_message(
                     subject="초코파이 인사이드 이메일 인증 코드입니다.",
                     recipients=[user_email],
                     body=f"요청하신 인증 코드는 [{verification_code}] 입니다."
                 )
-                mail.send(msg)
-                flash('이메일로 인증 코드를 발송했습니다.')
-                return redirect(url_for('auth.verify'))
+            except MailQueueFull:
+                flash('메일 발송 요청이 많습니다. 잠시 후 다시 시도해주세요.')
+                return redirect(url_for('auth.reset_password'))
+
+            session['verification_code'] = verification_code
+            session['mail'] = user_email
+            flash('이메일로 인증 코드를 발송했습니다.')
+            return redirect(url_for('auth.verify'))
 
     except Exception as e:
         print(f"오류: {e}")
         flash('오류가 발생했습니다.')
         return redirect(url_for('auth.reset_password'))
-    
-    finally:
-        if conn:
-            conn.close()
 
 @auth_bp.route('/verify', methods=['GET', 'POST'])
 def verify():
@@ -203,13 +185,11 @@ def verify():
 
         if user_code == session['verification_code']:
             new_password = generate_code()
-            hashed_password = generate_password_hash(new_password)
+            hashed_password = hasher.hash(new_password)
             
             conn = get_db_connection()
-            with conn.cursor() as cursor:
-                sql = "UPDATE users SET user_ps=%s WHERE user_mail=%s"
-                cursor.execute(sql, (hashed_password, user_mail,))
-                conn.commit()
+            UserRepo(conn).set_password_by_mail(user_mail, hashed_password)
+            conn.commit()
 
             session.pop('verification_code', None)
             session.pop('mail', None)
@@ -219,14 +199,14 @@ def verify():
             flash('인증 코드가 올바르지 않습니다.')
             return render_template('verify.html', mail=session.get('mail'))
 
+    except HasherBusy:
+        flash('요청이 많습니다. 잠시 후 다시 시도해주세요.')
+        return redirect(url_for('auth.verify'))
+
     except Exception as e:
         print(f"오류: {e}")
         flash('오류가 발생했습니다.')
         return redirect(url_for('auth.reset_password'))
-    
-    finally:
-        if conn:
-            conn.close()
 
 @auth_bp.route('/change_password', methods=['GET', 'POST'])
 def change_password():
@@ -253,30 +233,26 @@ def change_password():
             return redirect(url_for('auth.change_password'))
 
         conn = get_db_connection()
-        with conn.cursor() as cursor:
-            sql = "SELECT user_ps FROM users WHERE user_id=%s"
-            cursor.execute(sql, (user_id,))
-            user_info = cursor.fetchone()
+        users = UserRepo(conn)
+        user_info = users.get(user_id)
 
-        if not user_info or not check_password_hash(user_info['user_ps'], old_ps):
+        if not user_info or not hasher.verify(user_info['user_ps'], old_ps):
             flash('현재 비밀번호가 올바르지 않습니다.')
             return redirect(url_for('auth.change_password'))
 
-        hashed_password = generate_password_hash(new_ps)
-        with conn.cursor() as cursor:
-            sql = "UPDATE users SET user_ps=%s WHERE user_id=%s"
-            cursor.execute(sql, (hashed_password, user_id,))
-            conn.commit()
+        hashed_password = hasher.hash(new_ps)
+        users.set_password(user_id, hashed_password)
+        conn.commit()
         
         flash('비밀번호 변경이 완료되었습니다. 다시 로그인해주세요.')
         return redirect(url_for('auth.logout'))
 
+    except HasherBusy:
+        flash('요청이 많습니다. 잠시 후 다시 시도해주세요.')
+        return redirect(url_for('auth.change_password'))
+
     except Exception as e:
         print(f"데이터베이스 오류: {e}")
         flash('데이터베이스 처리 중 오류가 발생했습니다.')
         return redirect(url_for('main.main'))
     
-    finally:
-        if conn:
-            conn.close()
-
@@ -1,52 +1,66 @@
-from flask import Blueprint, request, render_template
-import pymysql
+from flask import Blueprint, request, render_template, url_for
+from markupsafe import Markup
+from services.db import get_db_connection
+from services import cache
+from services.repos import TopicRepo
 
 main_bp = Blueprint('main', __name__)
 
-db_config = None
-
-def get_db_connection():
-    return pymysql.connect(
-        host=db_config['host'],
-        port=db_config['port'],
-        user=db_config['user'],
-        password=db_config['password'],
-        db=db_config['db'],
-        charset=db_config['charset'],
-        cursorclass=pymysql.cursors.DictCursor
-    )
+POST_PER_PAGE = 10
+PAGER_WINDOW = 10
 
 def get_total_page(total_posts):
-    post_per_page = 10
+    post_per_page = POST_PER_PAGE
     if total_posts % post_per_page == 0:
         return total_posts // post_per_page
     else:
         return (total_posts // post_per_page) + 1
 
+def get_page_window(current_page, last_page, window=PAGER_WINDOW):
+    start = max(1, current_page - window // 2)
+    end = min(last_page, start + window - 1)
+    start = max(1, end - window + 1)
+    return range(start, end + 1)
+
+def render_topic_list(page, before=None, after=None):
+    topics = TopicRepo(get_db_connection())
+    total_posts = topics.count()
+    if total_posts is None:
+        total_posts = topics.reconcile_count()
+    return topic_list_markup(page, total_posts, *topics.page(page, POST_PER_PAGE, before, after))
+
+def topic_list_markup(page, total_posts, topics_from_db, has_prev, has_next):
+    prev_url, next_url = None, None
+    last_page = get_total_page(total_posts)
+    if not has_prev:
+        page = 1
+
+    if topics_from_db and has_prev:
+        prev_url = url_for('main.main', after=topics_from_db[0]['id'], page=page - 1)
+    if topics_from_db and has_next:
+        next_url = url_for('main.main', before=topics_from_db[-1]['id'], page=page + 1)
+
+    return Markup(render_template('_topic_list.html', topics=topics_from_db, current_page=page, last_page=last_page,
+                                  page_window=get_page_window(page, last_page), prev_url=prev_url, next_url=next_url))
+
+def empty_topic_list():
+    return Markup(render_template('_topic_list.html', topics=[], current_page=1, last_page=1,
+                                  page_window=get_page_window(1, 1), prev_url=None, next_url=None))
+
 @main_bp.route('/')
 def main():
-    conn = None
-    try:
-        conn = get_db_connection()
-        with conn.cursor() as cursor:
-            sql = "SELECT COUNT(*) as total_posts FROM topic"
-            cursor.execute(sql)
-            total_posts = int(cursor.fetchone()['total_posts'])
-            last_page = get_total_page(total_posts)
-            page = request.args.get('page', 1, type=int)
-            offset = (page - 1) * 10
-
-            sql_post = "SELECT * FROM topic ORDER BY id DESC LIMIT %s OFFSET %s"
-            cursor.execute(sql_post, (10, offset))
-            topics_from_db = cursor.fetchall()
-
-    except Exception as e:
-        print(f"데이터베이스 조회 오류: {e}")
-        topics_from_db = []
-        page, last_page = 1, 1
-
-    finally:
-        if conn:
-            conn.close()
-
-    return render_template('base.html', topics=topics_from_db, current_page=page, last_page=last_page)
+    page = max(request.args.get('page', 1, type=int), 1)
+    before = request.args.get('before', type=int)
+    after = request.args.get('after', type=int)
+
+    cache_key = (cache.check_version(get_db_connection), page, before, after)
+    topic_list = cache.topic_list_cache.get(cache_key)
+    if topic_list is None:
+        try:
+            topic_list = render_topic_list(page, before, after)
+            cache.topic_list_cache.set(cache_key, topic_list)
+        except Exception as e:
+            print(f"데이터베이스 조회 오류: {e}")
+            topic_list = empty_topic_list()
+
+    return render_template('base.html', topic_list=topic_list)
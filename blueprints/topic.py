@@ -1,32 +1,72 @@
-from flask import Blueprint, request, render_template, redirect, url_for, flash, session, send_from_directory
-from werkzeug.utils import secure_filename
-import pymysql
+from flask import Blueprint, Response, request, render_template, stream_template, redirect, url_for, flash, session, send_file
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.utils import secure_filename, send_file as werkzeug_send_file
+from services.db import get_db_connection
+from services import blobstore, cache, compression, file_gc, thumbnails
+from services.repos import TopicRepo, FileRepo
+from services.search import SEARCH_PER_PAGE
+from services.uploads import UploadTooLarge
 import os
+import time
 
 topic_bp = Blueprint('topic', __name__)
 
-db_config = None
 upload_folder = None
+download_offload = None
+accel_prefix = '/protected-uploads/'
+topic_access_ttl = 3600
 
 ALLOWED_EXTENTIONS = ('txt', 'png', 'jpg', 'jpeg')
 ALLOWED_MIMETYPES = ('text/plain', 'image/png', 'image/jpg', 'image/jpeg')
 MAX_FILE_SIZE = 30*1024*1024
+STREAM_THRESHOLD = 20
+MAX_TOPIC_GRANTS = 100
 
 def file_allow(filename, mimetype):
     return ('.' in filename and
             filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENTIONS and
             mimetype in ALLOWED_MIMETYPES)
 
-def get_db_connection():
-    return pymysql.connect(
-        host=db_config['host'],
-        port=db_config['port'],
-        user=db_config['user'],
-        password=db_config['password'],
-        db=db_config['db'],
-        charset=db_config['charset'],
-        cursorclass=pymysql.cursors.DictCursor
-    )
+def load_topic(id):
+    key = (cache.check_topic_version(get_db_connection), id)
+    cached = cache.topic_cache.get(key)
+    if cached is not None:
+        return cached
+
+    return cache_topic_row(key, TopicRepo(get_db_connection()).get_with_file(id))
+
+def split_topic_row(row):
+    if row is None:
+        return None, None
+
+    file_info = None
+    if row['file_topic_id'] is not None:
+        file_info = {'topic_id': row['file_topic_id'], 'file_name': row['file_name'], 'file_path': row['file_path']}
+    topic = {k: v for k, v in row.items() if k not in ('file_topic_id', 'file_name', 'file_path')}
+    return topic, file_info
+
+def cache_topic_row(key, row):
+    topic, file_info = split_topic_row(row)
+    if topic is not None:
+        cache.topic_cache.set(key, (topic, file_info))
+    return topic, file_info
+
+def grant_topic_access(id):
+    now = int(time.time())
+    grants = {k: v for k, v in session.get('topic_grants', {}).items() if v > now}
+    grants[str(id)] = now + topic_access_ttl
+    if len(grants) > MAX_TOPIC_GRANTS:
+        grants = dict(sorted(grants.items(), key=lambda item: item[1])[-MAX_TOPIC_GRANTS:])
+    session['topic_grants'] = grants
+
+def has_topic_grant(id):
+    expires_at = session.get('topic_grants', {}).get(str(id))
+    return expires_at is not None and expires_at > time.time()
+
+def has_topic_access(topic):
+    if topic['is_secret'] != 1:
+        return True
+    return has_topic_grant(topic['id']) or topic['post_user_id'] == session.get('user_id')
 
 @topic_bp.route('/read/<int:id>/', methods=['GET', 'POST'])
 def read(id):
@@ -34,34 +74,23 @@ def read(id):
         flash('로그인이 필요한 서비스입니다.')
         return redirect(url_for('auth.login'))
     
-    conn = None
     try:
-        conn = get_db_connection()
-        with conn.cursor() as cursor:
-            sql = "SELECT * FROM topic WHERE id = %s"
-            cursor.execute(sql, (id,))
-            topic = cursor.fetchone()
+        topic, file_info = load_topic(id)
 
         if topic is None:
             flash('존재하지 않는 게시글입니다.')
             return redirect(url_for('main.main'))
-        
-        file_info = None
-        with conn.cursor() as cursor:
-            sql="SELECT topic_id, file_name, file_path FROM files WHERE topic_id = %s"
-            cursor.execute(sql, (id,))
-            file_info = cursor.fetchone()
 
         if topic['is_secret'] == 1:
             if request.method == 'POST':
                 post_ps = request.form.get('secret_key')
                 if post_ps == topic['secret_key']:
-                    session[f'topic_{id}_access'] = True
+                    grant_topic_access(id)
                 else:
                     flash('비밀번호가 틀립니다.')
                     return redirect(url_for('main.main'))
             
-            if not session.get(f'topic_{id}_access') and topic['post_user_id'] != session.get('user_id'):
+            if not has_topic_access(topic):
                 return render_template('read_secret.html', topic=topic)
     
         return render_template('read.html', topic=topic, file=file_info)
@@ -70,10 +99,6 @@ def read(id):
         print(f"데이터베이스 조회 오류: {e}")
         flash('오류가 발생했습니다.')
         return redirect(url_for('main.main'))
-    
-    finally:
-        if conn:
-            conn.close()
 
 @topic_bp.route('/create/', methods=['GET', 'POST'])
 def create():
@@ -86,39 +111,40 @@ def create():
 
     conn = None
     try:
-        conn = get_db_connection()
         title = request.form['title']
         body = request.form['body']
         is_secret = 1 if 'is_secret' in request.form else 0
         secret_key = request.form.get('secret_key')
         user_id = session['user_id']
         user_name = session['user_name']
+        filepath = None
+
+        if 'file' in request.files and request.files['file'].filename != '':
+            f = request.files['file']
+            if not file_allow(f.filename, f.mimetype):                                                   
+                flash('허용되지 않는 파일 형식입니다.')                                                    
+                return redirect(url_for('topic.create'))                                                   
+                                                                                                
+            filename = secure_filename(f.filename)
+            try:
+                filepath = blobstore.store_upload(f, upload_folder, filename, MAX_FILE_SIZE).path
+            except UploadTooLarge:
+                flash('최대 30MB까지 허용됩니다.')
+                return redirect(url_for('topic.create'))
 
-        with conn.cursor() as cursor:
-            sql = "INSERT INTO topic (title, body, post_user_id, post_user_name, is_secret, secret_key) VALUES (%s, %s, %s, %s, %s, %s)"
-            cursor.execute(sql, (title, body, user_id, user_name, is_secret, secret_key))
-            new_id = cursor.lastrowid
-
-            if 'file' in request.files and request.files['file'].filename != '':
-                f = request.files['file']
-                if not file_allow(f.filename, f.mimetype):                                                   
-                    flash('허용되지 않는 파일 형식입니다.')                                                    
-                    return redirect(url_for('topic.create'))                                                   
-                                                                                                    
-                if len(f.read()) > MAX_FILE_SIZE:                                                              
-                    flash('최대 30MB까지 허용됩니다.')                                
-                    return redirect(url_for('topic.create'))                                                   
-                f.seek(0)
+        conn = get_db_connection()
+        new_id = TopicRepo(conn).create(title, body, user_id, user_name, is_secret, secret_key)
+        if filepath:
+            FileRepo(conn).add(new_id, filename, filepath)
 
-                filename = secure_filename(f.filename)
-                filepath = os.path.join(upload_folder, filename)
-                f.save(filepath)
-            
-                sql_file = "INSERT INTO files (topic_id, file_name, file_path) VALUES (%s, %s, %s)"
-                cursor.execute(sql_file, (new_id, filename, filepath))
+        conn.commit()
+        cache.invalidate_topic_list()
+        if filepath:
+            thumbnails.schedule_variants(filepath)
+        return redirect(url_for('topic.read', id=new_id))
 
-            conn.commit()
-            return redirect(url_for('topic.read', id=new_id))
+    except RequestEntityTooLarge:
+        raise
 
     except Exception as e:
         print(f"데이터 처리 오류: {e}")
@@ -126,10 +152,6 @@ def create():
             conn.rollback()
         flash('게시글 작성 중 오류가 발생했습니다.')
         return redirect(url_for('main.main'))
-    
-    finally:
-        if conn:
-            conn.close()
 
 @topic_bp.route('/download/<int:topic_id>')
 def download(topic_id):
@@ -137,30 +159,41 @@ def download(topic_id):
         flash('로그인이 필요한 서비스입니다.')
         return redirect(url_for('auth.login'))
     
-    conn = None
     try:
-        conn = get_db_connection()
-        with conn.cursor() as cursor:
-            sql = "SELECT file_name, file_path FROM files WHERE topic_id = %s"
-            cursor.execute(sql, (topic_id,))
-            file_info = cursor.fetchone()
-
-        if file_info:
-            file_name = file_info['file_name']
-            directory = os.path.dirname(file_info['file_path'])
-            return send_from_directory(directory, file_name, as_attachment=True)
-        else:
+        topic, file_info = load_topic(topic_id)
+
+        if topic is None or file_info is None:
             flash('파일을 찾을 수 없습니다.')
             return redirect(url_for('main.main'))
 
+        if not has_topic_access(topic):
+            return redirect(url_for('topic.read', id=topic_id))
+
+        compression.bypass()
+        relpath = blobstore.stored_relpath(file_info['file_path'])
+        file_path = os.path.abspath(os.path.join(upload_folder, relpath))
+        etag = os.path.basename(relpath).split('.')[0] if blobstore.is_blob_path(relpath) else True
+
+        if download_offload:
+            if etag is not True and etag in request.if_none_match:
+                response = Response(status=304)
+                response.set_etag(etag)
+                return response
+            response = werkzeug_send_file(file_path, request.environ, as_attachment=True,
+                                          download_name=file_info['file_name'], etag=etag, use_x_sendfile=True)
+            if download_offload == 'x-accel':
+                del response.headers['X-Sendfile']
+                response.headers['X-Accel-Redirect'] = accel_prefix + relpath
+        else:
+            response = send_file(file_path, as_attachment=True, download_name=file_info['file_name'],
+                                 conditional=True, etag=etag)
+        response.cache_control.private = True
+        return response
+
     except Exception as e:
         print(f"파일 다운로드 오류: {e}")
         flash('파일 다운로드 중 오류가 발생했습니다.')
         return redirect(url_for('main.main'))
-    
-    finally:
-        if conn:
-            conn.close()
 
 @topic_bp.route('/update/<int:id>', methods=['GET', 'POST'])
 def update(id):
@@ -172,11 +205,7 @@ def update(id):
     try:
         conn = get_db_connection()
         user_id = session.get('user_id')
-
-        with conn.cursor() as cursor:
-            sql = "SELECT * FROM topic WHERE id = %s"
-            cursor.execute(sql, (id,))
-            topic = cursor.fetchone()
+        topic, file_info = split_topic_row(TopicRepo(conn).get_with_file(id))
 
         if topic is None:
             flash('존재하지 않는 게시글입니다.')
@@ -190,9 +219,10 @@ def update(id):
             title = request.form['title']
             body = request.form['body']
 
-            with conn.cursor() as cursor:
-                sql = "UPDATE topic SET title=%s, body=%s WHERE id=%s"
-                cursor.execute(sql, (title, body, id))
+            TopicRepo(conn).update(id, title, body)
+
+            old_files = []
+            filepath = None
 
             if 'file' in request.files and request.files['file'].filename != '':
                 new_file = request.files['file']
@@ -200,50 +230,37 @@ def update(id):
                     flash('허용되지 않는 파일 형식입니다.')                                                    
                     return redirect(url_for('topic.create'))                                                   
                                                                                                     
-                if len(new_file.read()) > MAX_FILE_SIZE:                                                              
-                    flash('최대 30MB까지 허용됩니다.')                                
-                    return redirect(url_for('topic.create'))                                                   
-                new_file.seek(0)
                 filename = secure_filename(new_file.filename)
-                filepath = os.path.join(upload_folder, filename)
-                
-                new_file.save(filepath)
-
-                with conn.cursor() as cursor:
-                    sql = "SELECT file_name FROM files WHERE topic_id=%s"
-                    cursor.execute(sql, (id,))
-                    old_file = cursor.fetchone()
-                    if old_file:
-                        old_file_path = os.path.join(upload_folder, old_file['file_name'])
-                        if os.path.exists(old_file_path):
-                            os.remove(old_file_path)
-                        
-                        sql_delete = "DELETE FROM files WHERE topic_id=%s"
-                        cursor.execute(sql_delete, (id,))
-
-                with conn.cursor() as cursor:
-                    sql = "INSERT INTO files (topic_id, file_name, file_path) VALUES (%s, %s, %s)"
-                    cursor.execute(sql, (id, filename, filepath))
+                try:
+                    filepath = blobstore.store_upload(new_file, upload_folder, filename, MAX_FILE_SIZE).path
+                except UploadTooLarge:
+                    flash('최대 30MB까지 허용됩니다.')
+                    return redirect(url_for('topic.create'))
+
+                old_files = FileRepo(conn).replace_for_topic(id, filename, filepath)
+                file_gc.schedule_deletion(conn, old_files)
             
             conn.commit()
+            cache.invalidate_topic_list()
+            cache.invalidate_topic(id)
+            if old_files:
+                file_gc.wake()
+            if filepath:
+                thumbnails.schedule_variants(filepath)
             return redirect(url_for('topic.read', id=id))
             
         else:
-            with conn.cursor() as cursor:
-                sql = "SELECT * FROM files WHERE topic_id=%s"
-                cursor.execute(sql, (id,))
-                file_info = cursor.fetchone()
             return render_template('update.html', topic=topic, file=file_info)
             
+    except RequestEntityTooLarge:
+        raise
+
     except Exception as e:
         print(f"데이터 처리 오류: {e}")
         if conn:
             conn.rollback()
         flash('게시글 수정 중 오류가 발생했습니다.')
         return redirect(url_for('main.main'))
-    finally:
-        if conn:
-            conn.close()
 
 @topic_bp.route('/delete/<int:id>', methods=['POST'])
 def delete(id):
@@ -256,34 +273,26 @@ def delete(id):
         conn = get_db_connection()
         user_id = session.get('user_id')
 
-        with conn.cursor() as cursor:
-            sql = "SELECT post_user_id FROM topic WHERE id = %s"
-            cursor.execute(sql, (id,))
-            topic = cursor.fetchone()
+        topics = TopicRepo(conn)
+        post_user_id = topics.get_owner(id)
 
-        if topic is None:
+        if post_user_id is None:
             flash('존재하지 않는 게시글입니다.')
             return redirect(url_for('main.main'))
 
-        if topic['post_user_id'] != user_id:
+        if post_user_id != user_id:
             flash('삭제 권한이 없습니다.')
             return redirect(url_for('main.main'))
 
-        with conn.cursor() as cursor:
-            sql = "SELECT file_name FROM files WHERE topic_id = %s"
-            cursor.execute(sql, (id,))
-            file_to_delete = cursor.fetchone()
-
-            if file_to_delete:
-                file_path = os.path.join(upload_folder, file_to_delete['file_name'])
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-
-        with conn.cursor() as cursor:
-            sql = "DELETE FROM topic WHERE id = %s"
-            cursor.execute(sql, (id,))
+        files_to_delete = FileRepo(conn).paths_for_topic(id)
+        topics.delete(id)
+        file_gc.schedule_deletion(conn, files_to_delete)
         
         conn.commit()
+        cache.invalidate_topic_list()
+        cache.invalidate_topic(id)
+        if files_to_delete:
+            file_gc.wake()
         flash('게시글이 성공적으로 삭제되었습니다.')
         return redirect(url_for('main.main'))
 
@@ -293,10 +302,15 @@ def delete(id):
             conn.rollback()
         flash('오류가 발생하여 삭제에 실패했습니다.')
         return redirect(url_for('main.main'))
-    
-    finally:
-        if conn:
-            conn.close()
+
+def search_context(search_name, search_type, result):
+    topics_from_db, page, per_page, has_next = result
+    prev_url, next_url = None, None
+    if page > 1:
+        prev_url = url_for('topic.search', search_name=search_name, search_menu=search_type, page=page - 1, per_page=per_page)
+    if has_next:
+        next_url = url_for('topic.search', search_name=search_name, search_menu=search_type, page=page + 1, per_page=per_page)
+    return dict(things=topics_from_db, search_name=search_name, current_page=page, prev_url=prev_url, next_url=next_url)
 
 @topic_bp.route('/search/', methods=['GET'])
 def search():
@@ -306,32 +320,22 @@ def search():
     if not search_name or not search_name.strip():
         return render_template('search.html', topics=[])
     
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', SEARCH_PER_PAGE, type=int)
+
     conn = None
     try:
         conn = get_db_connection()
-        query = f"%{search_name}%"
-        
-        if search_type == 'title':
-            sql = "SELECT * FROM topic WHERE title LIKE %s ORDER BY id DESC"
-            params = (query,)
-        elif search_type == 'body':
-            sql = "SELECT * FROM topic WHERE body LIKE %s ORDER BY id DESC"
-            params = (query,)
-        elif search_type == 'title_body':
-            sql = "SELECT * FROM topic WHERE title LIKE %s OR body LIKE %s ORDER BY id DESC"
-            params = (query, query)
-        else:
+        result = TopicRepo(conn).search(search_type, search_name, page, per_page)
+        if result is None:
             return render_template('search.html', error="잘못된 검색 유형입니다.")
-
-        with conn.cursor() as cursor:
-            cursor.execute(sql, params)
-            topics_from_db = cursor.fetchall()
-        
-        return render_template('search.html', things=topics_from_db, search_name=search_name)
+        per_page = result[2]
+        context = search_context(search_name, search_type, result)
+        if per_page > STREAM_THRESHOLD:
+            compression.bypass()
+            return Response(stream_template('search.html', **context))
+        return render_template('search.html', **context)
         
     except Exception as e:
         print(f"데이터베이스 조회 오류: {e}")
         return render_template('search.html', error=f"데이터베이스 오류: {e}")
-    finally:
-        if conn:
-            conn.close()
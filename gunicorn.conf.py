@@ -0,0 +1,34 @@
+import multiprocessing
+import os
+import tempfile
+
+os.environ.setdefault('METRICS_DIR', os.path.join(tempfile.gettempdir(), 'choco_board_metrics'))
+
+wsgi_app = os.getenv('GUNICORN_APP', 'wsgi:app')
+bind = os.getenv('BIND', '0.0.0.0:8000')
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+preload_app = True
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = 30
+keepalive = 5
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = 200
+
+def on_starting(server):
+    metrics_dir = os.environ['METRICS_DIR']
+    for name in os.listdir(metrics_dir) if os.path.isdir(metrics_dir) else []:
+        if name.endswith('.json'):
+            os.remove(os.path.join(metrics_dir, name))
+
+def child_exit(server, worker):
+    try:
+        os.remove(os.path.join(os.environ['METRICS_DIR'], f"{worker.pid}.json"))
+    except OSError:
+        pass
+
+def post_fork(server, worker):
+    if wsgi_app == 'wsgi:app':
+        import wsgi
+        wsgi.post_fork()
@@ -0,0 +1,118 @@
+import asyncio
+import time
+
+from services import db
+
+try:
+    import aiomysql
+except ImportError:
+    aiomysql = None
+
+pool = None
+
+def notify_listeners(query, args, elapsed):
+    for listener in list(db.query_listeners):
+        listener(query, args, elapsed)
+
+if aiomysql is not None:
+    class ObservedAsyncCursor(aiomysql.DictCursor):
+        async def execute(self, query, args=None):
+            if not db.query_listeners:
+                return await super().execute(query, args)
+            started = time.perf_counter()
+            try:
+                return await super().execute(query, args)
+            finally:
+                notify_listeners(query, args, time.perf_counter() - started)
+
+class ThreadedCursor:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self._cursor.close()
+
+    async def execute(self, query, args=None):
+        return await asyncio.to_thread(self._cursor.execute, query, args)
+
+    async def fetchone(self):
+        return self._cursor.fetchone()
+
+    async def fetchall(self):
+        return self._cursor.fetchall()
+
+class ThreadedConnection:
+    dialect = 'sqlite'
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self):
+        return ThreadedCursor(self._conn.cursor())
+
+class ThreadedAcquire:
+    def __init__(self, sync_pool, slots):
+        self._pool = sync_pool
+        self._slots = slots
+        self._conn = None
+
+    async def __aenter__(self):
+        await self._slots.acquire()
+        try:
+            self._conn = await asyncio.to_thread(self._pool.checkout)
+        except BaseException:
+            self._slots.release()
+            raise
+        return ThreadedConnection(self._conn)
+
+    async def __aexit__(self, *exc):
+        try:
+            await asyncio.to_thread(self._pool.checkin, self._conn)
+        finally:
+            self._slots.release()
+
+class ThreadedPool:
+    def __init__(self, sync_pool):
+        self._pool = sync_pool
+        self._slots = asyncio.Semaphore(sync_pool.max_size)
+
+    def acquire(self):
+        return ThreadedAcquire(self._pool, self._slots)
+
+    def close(self):
+        pass
+
+    async def wait_closed(self):
+        pass
+
+async def init_pool(app, db_config):
+    global pool
+    if app.config['DB_BACKEND'] == 'sqlite':
+        pool = ThreadedPool(db.pool)
+        return pool
+    if aiomysql is None:
+        raise RuntimeError("ASGI 모드에는 aiomysql 패키지가 필요합니다.")
+    pool = await aiomysql.create_pool(
+        host=db_config['host'],
+        port=db_config['port'],
+        user=db_config['user'],
+        password=db_config['password'] or '',
+        db=db_config['db'],
+        charset=db_config['charset'],
+        minsize=app.config['DB_POOL_MIN_SIZE'],
+        maxsize=app.config['DB_POOL_MAX_SIZE'],
+        pool_recycle=app.config['DB_POOL_RECYCLE'],
+        autocommit=True,
+        cursorclass=ObservedAsyncCursor,
+    )
+    return pool
+
+async def close_pool():
+    global pool
+    if pool is not None:
+        pool.close()
+        await pool.wait_closed()
+        pool = None
@@ -0,0 +1,39 @@
+from services.repos import TopicRepo, UserRepo
+
+class AsyncRepo:
+    def __init__(self, conn):
+        self.conn = conn
+        self.dialect = getattr(conn, 'dialect', 'mysql')
+
+    async def _one(self, sql, params=()):
+        async with self.conn.cursor() as cursor:
+            await cursor.execute(sql, params)
+            return await cursor.fetchone()
+
+    async def _all(self, sql, params=()):
+        async with self.conn.cursor() as cursor:
+            await cursor.execute(sql, params)
+            return list(await cursor.fetchall())
+
+class AsyncTopicRepo(AsyncRepo, TopicRepo):
+    async def get_with_file(self, id):
+        return await self._one(self.GET_WITH_FILE, (id,))
+
+    async def count(self):
+        row = await self._one(self.GET_COUNT, (self.TOPIC_COUNT,))
+        return int(row['value']) if row else None
+
+    async def page(self, page, per_page, before=None, after=None):
+        sql, params = self.page_query(page, per_page, before, after)
+        return self.page_result(await self._all(sql, params), page, per_page, before, after)
+
+    async def search(self, search_type, search_name, page, per_page):
+        query = self.search_query(search_type, search_name, page, per_page)
+        if query is None:
+            return None
+        sql, params, page, per_page = query
+        return self.search_result(await self._all(sql, params), page, per_page)
+
+class AsyncUserRepo(AsyncRepo, UserRepo):
+    async def get_by_name(self, user_name):
+        return await self._one(self.GET_BY_NAME, (user_name,))
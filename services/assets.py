@@ -0,0 +1,113 @@
+from flask import abort, request, send_from_directory
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import tempfile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ASSET_DIRS = ('css', 'js')
+DIST_DIR = 'dist'
+MANIFEST_NAME = 'manifest.json'
+MIN_COMPRESS_SIZE = 256
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+
+manifest = {}
+hashed_files = set()
+dist_folder = None
+
+def hashed_name(relpath, content):
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    stem, ext = os.path.splitext(relpath)
+    return f"{stem}.{digest}{ext}"
+
+def write_file(path, content):
+    if os.path.exists(path):
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.asset-')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+def build_assets(static_folder):
+    dist = os.path.join(static_folder, DIST_DIR)
+    built = {}
+    for asset_dir in ASSET_DIRS:
+        for root, _, filenames in os.walk(os.path.join(static_folder, asset_dir)):
+            for filename in filenames:
+                path = os.path.join(root, filename)
+                relpath = os.path.relpath(path, static_folder).replace(os.sep, '/')
+                with open(path, 'rb') as f:
+                    content = f.read()
+
+                target = hashed_name(relpath, content)
+                target_path = os.path.join(dist, target)
+                write_file(target_path, content)
+                if len(content) >= MIN_COMPRESS_SIZE:
+                    write_file(target_path + '.gz', gzip.compress(content, 9, mtime=0))
+                    if brotli is not None:
+                        write_file(target_path + '.br', brotli.compress(content, quality=11))
+                built[relpath] = f"{DIST_DIR}/{target}"
+
+    os.makedirs(dist, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=dist, prefix='.manifest-')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(built, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, os.path.join(dist, MANIFEST_NAME))
+    return built
+
+def load_manifest(static_folder):
+    try:
+        with open(os.path.join(static_folder, DIST_DIR, MANIFEST_NAME), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def hashed_static_url(endpoint, values):
+    if endpoint == 'static':
+        hashed = manifest.get(values.get('filename'))
+        if hashed is not None:
+            values['filename'] = hashed
+
+def serve_asset(filename):
+    mimetype = mimetypes.guess_type(filename)[0]
+    if mimetype is None or f"{DIST_DIR}/{filename}" not in hashed_files:
+        abort(404)
+
+    encoding = None
+    chosen = filename
+    accepted = request.accept_encodings
+    for candidate, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if accepted[candidate] and os.path.exists(os.path.join(dist_folder, filename + suffix)):
+            encoding, chosen = candidate, filename + suffix
+            break
+
+    response = send_from_directory(dist_folder, chosen, mimetype=mimetype, max_age=31536000)
+    if encoding:
+        response.content_encoding = encoding
+    response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = IMMUTABLE_CACHE
+    return response
+
+def init_assets(app):
+    global manifest, hashed_files, dist_folder
+    dist_folder = os.path.join(app.static_folder, DIST_DIR)
+    if app.config['ASSETS_BUILD_ON_STARTUP']:
+        try:
+            manifest = build_assets(app.static_folder)
+        except OSError as e:
+            print(f"정적 파일 빌드 오류: {e}")
+            manifest = load_manifest(app.static_folder)
+    else:
+        manifest = load_manifest(app.static_folder)
+
+    hashed_files = set(manifest.values())
+    app.url_defaults(hashed_static_url)
+    app.add_url_rule(f"{app.static_url_path}/{DIST_DIR}/<path:filename>", 'dist_asset', serve_asset)
+    return manifest
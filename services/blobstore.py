@@ -0,0 +1,105 @@
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+
+from services.db import index_exists
+from services.repos import FileRepo, UserRepo
+from services.thumbnails import variant_relpaths
+from services.uploads import receive_upload, CHUNK_SIZE
+
+BLOB_PATH_RE = re.compile(r'^[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}(\.[a-z0-9]+)?$')
+
+def blob_relpath(sha256, filename):
+    ext = os.path.splitext(filename)[1].lower()
+    return f"{sha256[:2]}/{sha256[2:4]}/{sha256}{ext}"
+
+def is_blob_path(relpath):
+    return bool(relpath) and BLOB_PATH_RE.match(relpath) is not None
+
+def stored_relpath(relpath):
+    # 이전 전의 행은 'static/uploads/<파일명>' 또는 파일명만 저장되어 있음
+    if not relpath or is_blob_path(relpath):
+        return relpath
+    return os.path.basename(relpath)
+
+def _commit_blob(upload_folder, tmp_path, relpath):
+    dest = os.path.join(upload_folder, relpath)
+    if os.path.exists(dest):
+        os.remove(tmp_path)
+        os.utime(dest)
+    else:
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        os.replace(tmp_path, dest)
+    return relpath
+
+def store_upload(file_storage, upload_folder, filename, max_size):
+    received = receive_upload(file_storage, upload_folder, max_size)
+    relpath = blob_relpath(received.sha256, filename)
+    try:
+        _commit_blob(upload_folder, received.path, relpath)
+    except BaseException:
+        if os.path.exists(received.path):
+            os.remove(received.path)
+        raise
+    return received._replace(path=relpath)
+
+def ingest_file(upload_folder, src_path):
+    digest = hashlib.sha256()
+    with open(src_path, 'rb') as src:
+        for chunk in iter(lambda: src.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    relpath = blob_relpath(digest.hexdigest(), src_path)
+    if not os.path.exists(os.path.join(upload_folder, relpath)):
+        fd, tmp_path = tempfile.mkstemp(dir=upload_folder, prefix='.upload-')
+        os.close(fd)
+        shutil.copyfile(src_path, tmp_path)
+        _commit_blob(upload_folder, tmp_path, relpath)
+    return relpath
+
+def remove_blob(upload_folder, relpath):
+    for path in [relpath] + variant_relpaths(relpath):
+        path = os.path.join(upload_folder, path)
+        if os.path.exists(path):
+            os.remove(path)
+
+def migrate_uploads(conn, upload_folder):
+    migrated = set()
+    moved = 0
+    files, users = FileRepo(conn), UserRepo(conn)
+
+    for row in files.all():
+        if is_blob_path(row['file_path']):
+            continue
+        src_path = os.path.join(upload_folder, row['file_name'])
+        if not os.path.exists(src_path):
+            print(f"파일을 찾을 수 없습니다: {src_path}")
+            continue
+        relpath = ingest_file(upload_folder, src_path)
+        files.set_path(row['id'], relpath)
+        migrated.add(src_path)
+        moved += 1
+
+    for row in users.profile_images():
+        if is_blob_path(row['profile_image']):
+            continue
+        src_path = os.path.join(upload_folder, row['profile_image'])
+        if not os.path.exists(src_path):
+            print(f"파일을 찾을 수 없습니다: {src_path}")
+            continue
+        relpath = ingest_file(upload_folder, src_path)
+        users.set_profile_image(row['id'], relpath)
+        migrated.add(src_path)
+        moved += 1
+
+    conn.commit()
+    for src_path in migrated:
+        os.remove(src_path)
+    return moved
+
+def ensure_blob_indexes(cursor):
+    if not index_exists(cursor, 'files', 'ix_files_file_path'):
+        cursor.execute("CREATE INDEX ix_files_file_path ON files (file_path)")
+    if not index_exists(cursor, 'users', 'ix_users_profile_image'):
+        cursor.execute("CREATE INDEX ix_users_profile_image ON users (profile_image)")
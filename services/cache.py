@@ -0,0 +1,116 @@
+from collections import OrderedDict
+import threading
+import time
+
+from services.repos import TopicRepo
+
+topic_list_cache = None
+topic_cache = None
+version = None
+topic_version = None
+version_check_interval = 1.0
+_version_checked_at = 0.0
+
+class LRUCache:
+    def __init__(self, maxsize=128, ttl=30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+            }
+
+def init_caches(app):
+    global topic_list_cache, topic_cache, version, topic_version, version_check_interval, _version_checked_at
+    topic_list_cache = LRUCache(app.config['TOPIC_LIST_CACHE_SIZE'], app.config['TOPIC_LIST_CACHE_TTL'])
+    topic_cache = LRUCache(app.config['TOPIC_CACHE_SIZE'], app.config['TOPIC_CACHE_TTL'])
+    version = None
+    topic_version = None
+    version_check_interval = app.config['CACHE_VERSION_CHECK_INTERVAL']
+    _version_checked_at = 0.0
+
+def version_due():
+    return time.monotonic() - _version_checked_at >= version_check_interval
+
+def sync_versions(connect):
+    global version, topic_version, _version_checked_at
+    if not version_due():
+        return
+    _version_checked_at = time.monotonic()
+    try:
+        current, current_topic = TopicRepo(connect()).cache_versions()
+    except Exception as e:
+        print(f"캐시 버전 확인 오류: {e}")
+        return
+    if current != version:
+        version = current
+        if topic_list_cache is not None:
+            topic_list_cache.clear()
+    if current_topic != topic_version:
+        topic_version = current_topic
+        if topic_cache is not None:
+            topic_cache.clear()
+
+def check_version(connect):
+    sync_versions(connect)
+    return version
+
+def check_topic_version(connect):
+    sync_versions(connect)
+    return topic_version
+
+def expire_version():
+    global _version_checked_at
+    _version_checked_at = 0.0
+
+def invalidate_topic_list():
+    expire_version()
+    if topic_list_cache is not None:
+        topic_list_cache.clear()
+
+def invalidate_topic(id):
+    expire_version()
+    if topic_cache is not None:
+        topic_cache.delete((topic_version, id))
+
+def invalidate_all_topics():
+    expire_version()
+    if topic_cache is not None:
+        topic_cache.clear()
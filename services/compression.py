@@ -0,0 +1,112 @@
+from flask import request
+from werkzeug.http import parse_accept_header, quote_etag, unquote_etag
+import functools
+import gzip
+import hashlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+BYPASS_KEY = 'board.compression.bypass'
+COMPRESSIBLE_TYPES = ('text/html', 'text/plain', 'application/json')
+
+def unsupported_write(data):
+    raise RuntimeError("압축 미들웨어는 write()를 지원하지 않습니다.")
+
+def bypass():
+    request.environ[BYPASS_KEY] = True
+
+def weak_etag(body):
+    return quote_etag(hashlib.sha1(body).hexdigest()[:20], weak=True)
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    value = unquote_etag(etag)[0]
+    return any(unquote_etag(candidate.strip())[0] == value for candidate in if_none_match.split(','))
+
+@functools.lru_cache(maxsize=64)
+def choose_encoding(accept_encoding):
+    accepted = parse_accept_header(accept_encoding)
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+class CompressionMiddleware:
+    def __init__(self, app, min_size=1024, gzip_level=6, brotli_quality=5):
+        self.app = app
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def compress(self, body, encoding):
+        if encoding == 'br':
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, self.gzip_level, mtime=0)
+
+    def applies(self, environ, status, headers):
+        present = {name.lower(): value for name, value in headers}
+        return not (environ.get(BYPASS_KEY) or not status.startswith('200')
+                    or 'content-length' not in present or 'content-encoding' in present
+                    or 'etag' in present or 'content-disposition' in present
+                    or present.get('content-type', '').split(';')[0] not in COMPRESSIBLE_TYPES)
+
+    def encode(self, environ, status, headers, body):
+        etag = weak_etag(body)
+        if etag_matches(environ.get('HTTP_IF_NONE_MATCH'), etag):
+            headers = [(name, value) for name, value in headers
+                       if name.lower() not in ('content-length', 'content-type')]
+            return '304 NOT MODIFIED', headers + [('ETag', etag)], b''
+
+        extra = [('ETag', etag)]
+        if len(body) >= self.min_size:
+            vary = next((value for name, value in headers if name.lower() == 'vary'), None)
+            headers = [(name, value) for name, value in headers if name.lower() != 'vary']
+            extra.append(('Vary', f"{vary}, Accept-Encoding" if vary else 'Accept-Encoding'))
+            encoding = choose_encoding(environ.get('HTTP_ACCEPT_ENCODING', ''))
+            if encoding:
+                body = self.compress(body, encoding)
+                headers = [(name, value) for name, value in headers if name.lower() != 'content-length']
+                extra += [('Content-Encoding', encoding), ('Content-Length', str(len(body)))]
+        return status, headers + extra, body
+
+    def __call__(self, environ, start_response):
+        if environ['REQUEST_METHOD'] != 'GET':
+            return self.app(environ, start_response)
+
+        captured = []
+
+        def capture(status, headers, exc_info=None):
+            captured[:] = [status, headers, exc_info]
+            return unsupported_write
+
+        app_iter = self.app(environ, capture)
+        status, headers, exc_info = captured
+        if not self.applies(environ, status, headers):
+            start_response(status, headers, exc_info)
+            return app_iter
+
+        try:
+            body = b''.join(app_iter)
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+
+        status, headers, body = self.encode(environ, status, headers, body)
+        start_response(status, headers, exc_info)
+        return [body] if body else []
+
+def init_compression(app):
+    app.wsgi_app = CompressionMiddleware(
+        app.wsgi_app,
+        min_size=app.config['COMPRESS_MIN_SIZE'],
+        gzip_level=app.config['COMPRESS_GZIP_LEVEL'],
+        brotli_quality=app.config['COMPRESS_BROTLI_QUALITY'],
+    )
+    return app.wsgi_app
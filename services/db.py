@@ -0,0 +1,205 @@
+from flask import g
+from contextlib import contextmanager
+import os
+import threading
+import time
+import pymysql
+
+pool = None
+query_listeners = []
+
+class PoolTimeout(Exception):
+    pass
+
+class ObservedCursor(pymysql.cursors.DictCursor):
+    def execute(self, query, args=None):
+        if not query_listeners:
+            return super().execute(query, args)
+        started = time.perf_counter()
+        try:
+            return super().execute(query, args)
+        finally:
+            elapsed = time.perf_counter() - started
+            for listener in list(query_listeners):
+                listener(query, args, elapsed)
+
+class ConnectionPool:
+    def __init__(self, db_config, min_size=2, max_size=10, timeout=5, recycle=3600):
+        self.db_config = db_config
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.recycle = recycle
+
+        self._idle = []
+        self._in_use = 0
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+
+        self._checkouts = 0
+        self._checkout_failures = 0
+        self._wait_time = 0.0
+        self._pid = os.getpid()
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._idle = []
+        self._in_use = 0
+        self._pid = os.getpid()
+
+    def _connect(self):
+        conn = pymysql.connect(
+            host=self.db_config['host'],
+            port=self.db_config['port'],
+            user=self.db_config['user'],
+            password=self.db_config['password'],
+            db=self.db_config['db'],
+            charset=self.db_config['charset'],
+            cursorclass=ObservedCursor
+        )
+        conn._pool_created_at = time.monotonic()
+        return conn
+
+    def _is_alive(self, conn):
+        if time.monotonic() - conn._pool_created_at > self.recycle:
+            return False
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def fill(self):
+        if self._pid != os.getpid():
+            self._after_fork()
+        while True:
+            with self._lock:
+                if len(self._idle) + self._in_use >= self.min_size:
+                    return
+                self._in_use += 1
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._lock:
+                    self._in_use -= 1
+                    self._available.notify()
+                raise
+            with self._lock:
+                self._in_use -= 1
+                self._idle.append(conn)
+                self._available.notify()
+
+    def checkout(self):
+        if self._pid != os.getpid():
+            self._after_fork()
+        started = time.monotonic()
+        deadline = started + self.timeout
+        with self._lock:
+            while not self._idle and self._in_use >= self.max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._checkout_failures += 1
+                    raise PoolTimeout(f"{self.timeout}초 안에 DB 연결을 얻지 못했습니다.")
+                self._available.wait(remaining)
+            conn = self._idle.pop() if self._idle else None
+            self._in_use += 1
+            self._checkouts += 1
+            self._wait_time += time.monotonic() - started
+
+        try:
+            if conn is not None and not self._is_alive(conn):
+                self._discard(conn)
+                conn = None
+            if conn is None:
+                conn = self._connect()
+            return conn
+        except Exception:
+            with self._lock:
+                self._in_use -= 1
+                self._checkout_failures += 1
+                self._available.notify()
+            raise
+
+    def checkin(self, conn):
+        try:
+            conn.rollback()
+            reusable = True
+        except Exception:
+            reusable = False
+
+        with self._lock:
+            self._in_use -= 1
+            if reusable and len(self._idle) + self._in_use < self.max_size:
+                self._idle.append(conn)
+                conn = None
+            self._available.notify()
+
+        if conn is not None:
+            self._discard(conn)
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            self._discard(conn)
+
+    @contextmanager
+    def connection(self):
+        conn = self.checkout()
+        try:
+            yield conn
+        finally:
+            self.checkin(conn)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'max_size': self.max_size,
+                'checkouts': self._checkouts,
+                'checkout_failures': self._checkout_failures,
+                'wait_time': self._wait_time,
+            }
+
+def add_query_listener(listener):
+    if listener not in query_listeners:
+        query_listeners.append(listener)
+
+def remove_query_listener(listener):
+    if listener in query_listeners:
+        query_listeners.remove(listener)
+
+def index_exists(cursor, table, index_name):
+    sql = "SELECT 1 FROM information_schema.statistics WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s LIMIT 1"
+    cursor.execute(sql, (table, index_name))
+    return cursor.fetchone() is not None
+
+def init_pool(app, db_config, pool_class=ConnectionPool):
+    global pool
+    pool = pool_class(
+        db_config,
+        min_size=app.config['DB_POOL_MIN_SIZE'],
+        max_size=app.config['DB_POOL_MAX_SIZE'],
+        timeout=app.config['DB_POOL_TIMEOUT'],
+        recycle=app.config['DB_POOL_RECYCLE'],
+    )
+    app.teardown_appcontext(release_db_connection)
+    return pool
+
+def get_db_connection():
+    if 'db_conn' not in g:
+        g.db_conn = pool.checkout()
+    return g.db_conn
+
+def release_db_connection(exc=None):
+    conn = g.pop('db_conn', None)
+    if conn is not None:
+        pool.checkin(conn)
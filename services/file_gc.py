@@ -0,0 +1,159 @@
+import os
+import re
+import threading
+import time
+
+from services import blobstore, db
+from services.repos import FileRepo
+from services.thumbnails import IMAGE_EXTENSIONS
+
+VARIANT_SUFFIX_RE = re.compile(r'_w\d+\.jpg$')
+TEMP_PREFIXES = ('.upload-', '.variant-')
+
+sweeper = None
+
+def schedule_deletion(conn, relpaths):
+    relpaths = sorted({relpath for relpath in relpaths if blobstore.is_blob_path(relpath)})
+    if relpaths:
+        FileRepo(conn).schedule_deletion(relpaths)
+
+def recently_touched(upload_folder, relpath, grace):
+    try:
+        return os.path.getmtime(os.path.join(upload_folder, relpath)) > time.time() - grace
+    except OSError:
+        return False
+
+def process_pending(conn, upload_folder, batch_size, grace):
+    files = FileRepo(conn)
+    rows = files.claim_pending(batch_size)
+    if not rows:
+        conn.commit()
+        return 0
+
+    referenced = files.referenced(sorted({row['file_path'] for row in rows}))
+    done_ids = []
+    for row in rows:
+        relpath = row['file_path']
+        if relpath not in referenced and recently_touched(upload_folder, relpath, grace):
+            continue
+        if relpath not in referenced:
+            blobstore.remove_blob(upload_folder, relpath)
+        done_ids.append(row['id'])
+
+    files.delete_pending(done_ids)
+    conn.commit()
+    return len(done_ids)
+
+def has_original(upload_folder, variant_relpath):
+    stem = VARIANT_SUFFIX_RE.sub('', variant_relpath)
+    return any(os.path.exists(os.path.join(upload_folder, stem + ext)) for ext in IMAGE_EXTENSIONS)
+
+def reconcile(conn, upload_folder, batch_size, grace):
+    removed = 0
+    cutoff = time.time() - grace
+    batch = []
+
+    def flush():
+        nonlocal removed
+        referenced = FileRepo(conn).referenced(batch)
+        conn.commit()
+        for relpath in batch:
+            if relpath in referenced:
+                continue
+            if blobstore.is_blob_path(relpath):
+                blobstore.remove_blob(upload_folder, relpath)
+            elif os.path.exists(os.path.join(upload_folder, relpath)):
+                os.remove(os.path.join(upload_folder, relpath))
+            removed += 1
+        batch.clear()
+
+    for root, _, filenames in os.walk(upload_folder):
+        for filename in filenames:
+            path = os.path.join(root, filename)
+            try:
+                if os.path.getmtime(path) > cutoff:
+                    continue
+            except OSError:
+                continue
+
+            if filename.startswith(TEMP_PREFIXES):
+                os.remove(path)
+                removed += 1
+                continue
+
+            relpath = os.path.relpath(path, upload_folder).replace(os.sep, '/')
+            if VARIANT_SUFFIX_RE.search(relpath):
+                if has_original(upload_folder, relpath):
+                    continue
+            elif not blobstore.is_blob_path(relpath):
+                continue
+
+            batch.append(relpath)
+            if len(batch) >= batch_size:
+                flush()
+
+    if batch:
+        flush()
+    return removed
+
+class FileSweeper:
+    def __init__(self, upload_folder, interval=30, reconcile_interval=3600, batch_size=500, grace=3600):
+        self.upload_folder = upload_folder
+        self.interval = interval
+        self.reconcile_interval = reconcile_interval
+        self.batch_size = batch_size
+        self.grace = grace
+
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._last_reconcile = time.monotonic()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='file-sweeper', daemon=True)
+                self._thread.start()
+
+    def wake(self):
+        self.start()
+        self._wakeup.set()
+
+    def run_once(self, reconcile_orphans=False):
+        processed = removed = 0
+        with db.pool.connection() as conn:
+            while True:
+                count = process_pending(conn, self.upload_folder, self.batch_size, self.grace)
+                processed += count
+                if count < self.batch_size:
+                    break
+            if reconcile_orphans:
+                removed = reconcile(conn, self.upload_folder, self.batch_size, self.grace)
+        return processed, removed
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            due = time.monotonic() - self._last_reconcile >= self.reconcile_interval
+            try:
+                self.run_once(reconcile_orphans=due)
+            except Exception as e:
+                print(f"파일 정리 오류: {e}")
+            if due:
+                self._last_reconcile = time.monotonic()
+
+def init_sweeper(app):
+    global sweeper
+    sweeper = FileSweeper(
+        app.config['UPLOAD_FOLDER'],
+        interval=app.config['FILE_GC_INTERVAL'],
+        reconcile_interval=app.config['FILE_GC_RECONCILE_INTERVAL'],
+        batch_size=app.config['FILE_GC_BATCH_SIZE'],
+        grace=app.config['FILE_GC_GRACE'],
+    )
+    return sweeper
+
+def wake():
+    if sweeper is not None:
+        sweeper.wake()
@@ -0,0 +1,86 @@
+from concurrent.futures import TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from werkzeug.security import generate_password_hash, check_password_hash
+import threading
+
+class HasherBusy(Exception):
+    pass
+
+class PasswordHasher:
+    def __init__(self, method='scrypt:32768:8:1', max_workers=2, max_pending=8, timeout=3.0):
+        self.method = method
+        # 'pbkdf2' 처럼 생략된 설정도 실제 저장되는 접두어와 비교해야 한다
+        self.prefix = generate_password_hash('', method).split('$', 1)[0]
+        self.max_workers = max_workers
+        self.timeout = timeout
+
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+
+        self.rejected = 0
+        self.timed_out = 0
+
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                from concurrent.futures import ProcessPoolExecutor
+                import multiprocessing
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                     mp_context=multiprocessing.get_context('forkserver'))
+            return self._executor
+
+    def _drop_executor(self, executor):
+        with self._executor_lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise HasherBusy("비밀번호 처리 대기열이 가득 찼습니다.")
+        executor = self._get_executor()
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool:
+            self._slots.release()
+            self._drop_executor(executor)
+            raise HasherBusy("비밀번호 처리 프로세스가 종료되었습니다.")
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda f: self._slots.release())
+
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            future.cancel()
+            self.timed_out += 1
+            raise HasherBusy("비밀번호 처리 시간이 초과되었습니다.")
+        except BrokenProcessPool:
+            self._drop_executor(executor)
+            raise HasherBusy("비밀번호 처리 프로세스가 종료되었습니다.")
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, pwhash, password):
+        return self._run(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash):
+        return pwhash.split('$', 1)[0] != self.prefix
+
+    def stats(self):
+        return {
+            'rejected': self.rejected,
+            'timed_out': self.timed_out,
+        }
+
+def init_hasher(app):
+    return PasswordHasher(
+        method=app.config['PASSWORD_HASH_METHOD'],
+        max_workers=app.config['PASSWORD_HASH_WORKERS'],
+        max_pending=app.config['PASSWORD_HASH_MAX_PENDING'],
+        timeout=app.config['PASSWORD_HASH_TIMEOUT'],
+    )
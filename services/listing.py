@@ -0,0 +1,8 @@
+from services.db import index_exists
+
+LIST_COLUMNS = "id, title, post_user_name, is_secret"
+LIST_INDEX = 'ix_topic_list'
+
+def ensure_list_index(cursor):
+    if not index_exists(cursor, 'topic', LIST_INDEX):
+        cursor.execute(f"CREATE INDEX {LIST_INDEX} ON topic ({LIST_COLUMNS})")
@@ -0,0 +1,150 @@
+from email.message import EmailMessage
+from email.utils import formataddr
+import queue
+import smtplib
+import threading
+import time
+
+class MailQueueFull(Exception):
+    pass
+
+class SMTPBackend:
+    def __init__(self, host, port, use_tls=False, username=None, password=None, timeout=10):
+        self.host = host
+        self.port = port
+        self.use_tls = use_tls
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self._conn = None
+
+    def _connect(self):
+        conn = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.use_tls:
+            conn.starttls()
+        if self.username:
+            conn.login(self.username, self.password)
+        return conn
+
+    def send(self, msg):
+        if self._conn is None:
+            self._conn = self._connect()
+        self._conn.send_message(msg)
+
+    def close(self):
+        if self._conn is not None:
+            try:
+                self._conn.quit()
+            except Exception:
+                pass
+            self._conn = None
+
+class MemoryBackend:
+    def __init__(self):
+        self.outbox = []
+
+    def send(self, msg):
+        self.outbox.append(msg)
+
+    def close(self):
+        pass
+
+class MailQueue:
+    def __init__(self, backend, sender, maxsize=100, batch_size=20, max_retries=3,
+                 backoff=1.0, put_timeout=0.5, idle_timeout=30):
+        self.backend = backend
+        self.sender = sender
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.put_timeout = put_timeout
+        self.idle_timeout = idle_timeout
+
+        self._queue = queue.Queue(maxsize)
+        self._worker = None
+        self._lock = threading.Lock()
+
+        self.sent = 0
+        self.failed = 0
+
+    def send_message(self, subject, recipients, body):
+        msg = EmailMessage()
+        msg['Subject'] = subject
+        if self.sender:
+            msg['From'] = self.sender
+        msg['To'] = ', '.join(recipients)
+        msg.set_content(body)
+        self.send(msg)
+
+    def send(self, msg):
+        self._ensure_worker()
+        try:
+            self._queue.put(msg, timeout=self.put_timeout)
+        except queue.Full:
+            raise MailQueueFull("메일 발송 대기열이 가득 찼습니다.")
+
+    def join(self):
+        self._queue.join()
+
+    def stats(self):
+        return {
+            'queued': self._queue.qsize(),
+            'sent': self.sent,
+            'failed': self.failed,
+        }
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='mail-queue', daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self.idle_timeout)]
+            except queue.Empty:
+                self.backend.close()
+                continue
+
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            for msg in batch:
+                self._deliver(msg)
+                self._queue.task_done()
+
+    def _deliver(self, msg):
+        for attempt in range(self.max_retries):
+            try:
+                self.backend.send(msg)
+                self.sent += 1
+                return
+            except Exception as e:
+                print(f"메일 발송 오류 ({attempt + 1}/{self.max_retries}): {e}")
+                self.backend.close()
+                time.sleep(self.backoff * (2 ** attempt))
+        self.failed += 1
+
+def init_mail(app):
+    if app.config['MAIL_BACKEND'] == 'memory':
+        backend = MemoryBackend()
+    else:
+        backend = SMTPBackend(
+            app.config['MAIL_SERVER'],
+            app.config['MAIL_PORT'],
+            use_tls=app.config['MAIL_USE_TLS'],
+            username=app.config['MAIL_USERNAME'],
+            password=app.config['MAIL_PASSWORD'],
+        )
+    name, address = app.config['MAIL_DEFAULT_SENDER']
+    return MailQueue(
+        backend,
+        formataddr((name, address)) if address else None,
+        maxsize=app.config['MAIL_QUEUE_SIZE'],
+        batch_size=app.config['MAIL_BATCH_SIZE'],
+        max_retries=app.config['MAIL_MAX_RETRIES'],
+    )
@@ -0,0 +1,316 @@
+from flask import Response, abort, g, has_request_context, request, before_render_template, template_rendered
+import bisect
+import hmac
+import json
+import os
+import tempfile
+import threading
+import time
+
+from services import cache, db
+from services.slow_queries import is_admin
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+registry = None
+metrics_dir = None
+metrics_token = None
+flush_interval = 5.0
+_flusher = None
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self, name, labels):
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            yield f'{name}_bucket', f'{labels},le="{le}"', cumulative
+        yield f'{name}_sum', labels, self.sum
+        yield f'{name}_count', labels, self.count
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency = {}
+        self.render_time = {}
+        self.statuses = {}
+        self.db_queries = {}
+        self.db_time = {}
+        self.upload_bytes = {}
+        self.collectors = []
+
+    def observe_request(self, endpoint, status, elapsed, queries, query_time, render_time, upload_bytes):
+        with self._lock:
+            histogram = self.latency.get(endpoint)
+            if histogram is None:
+                histogram = self.latency[endpoint] = Histogram()
+                self.render_time[endpoint] = Histogram()
+            histogram.observe(elapsed)
+            if render_time:
+                self.render_time[endpoint].observe(render_time)
+            key = (endpoint, status)
+            self.statuses[key] = self.statuses.get(key, 0) + 1
+            self.db_queries[endpoint] = self.db_queries.get(endpoint, 0) + queries
+            self.db_time[endpoint] = self.db_time.get(endpoint, 0.0) + query_time
+            if upload_bytes:
+                self.upload_bytes[endpoint] = self.upload_bytes.get(endpoint, 0) + upload_bytes
+
+    def add_collector(self, collector):
+        self.collectors.append(collector)
+
+    def families(self):
+        families = []
+        with self._lock:
+            samples = []
+            for endpoint, histogram in sorted(self.latency.items()):
+                samples += histogram.samples('board_request_duration_seconds', f'endpoint="{escape_label(endpoint)}"')
+            families.append(('board_request_duration_seconds', 'Request latency by endpoint.', 'histogram', samples))
+
+            samples = []
+            for endpoint, histogram in sorted(self.render_time.items()):
+                if histogram.count:
+                    samples += histogram.samples('board_template_render_seconds', f'endpoint="{escape_label(endpoint)}"')
+            families.append(('board_template_render_seconds', 'Template render time per request by endpoint.',
+                             'histogram', samples))
+
+            families.append(('board_requests_total', 'Requests by endpoint and status code.', 'counter',
+                             [('board_requests_total', f'endpoint="{escape_label(endpoint)}",status="{status}"', count)
+                              for (endpoint, status), count in sorted(self.statuses.items())]))
+            families.append(('board_db_queries_total', 'DB queries issued by endpoint.', 'counter',
+                             [('board_db_queries_total', f'endpoint="{escape_label(endpoint)}"', count)
+                              for endpoint, count in sorted(self.db_queries.items())]))
+            families.append(('board_db_query_seconds_total', 'Time spent in DB queries by endpoint.', 'counter',
+                             [('board_db_query_seconds_total', f'endpoint="{escape_label(endpoint)}"', seconds)
+                              for endpoint, seconds in sorted(self.db_time.items())]))
+            families.append(('board_upload_bytes_total', 'Uploaded request body bytes by endpoint.', 'counter',
+                             [('board_upload_bytes_total', f'endpoint="{escape_label(endpoint)}"', size)
+                              for endpoint, size in sorted(self.upload_bytes.items())]))
+
+        for collector in self.collectors:
+            try:
+                families += collector()
+            except Exception as e:
+                print(f"메트릭 수집 오류: {e}")
+        return families
+
+    def render(self):
+        return render_families(self.families())
+
+def render_families(families):
+    lines = []
+    for name, help_text, kind, samples in families:
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}']
+        for sample, labels, value in samples:
+            lines.append(f'{sample}{{{labels}}} {value}' if labels else f'{sample} {value}')
+    return '\n'.join(lines) + '\n'
+
+def gauge_lines(name, help_text, values, kind='gauge'):
+    samples = []
+    for labels, value in values:
+        samples.append((name, ','.join(f'{k}="{escape_label(v)}"' for k, v in labels.items()), value))
+    return [(name, help_text, kind, samples)]
+
+def snapshot_path(pid):
+    return os.path.join(metrics_dir, f"{pid}.json")
+
+def write_snapshot():
+    fd, tmp_path = tempfile.mkstemp(dir=metrics_dir, prefix='.snapshot-')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(registry.families(), f)
+        os.replace(tmp_path, snapshot_path(os.getpid()))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def render_workers():
+    write_snapshot()
+    merged = {}
+    for filename in sorted(os.listdir(metrics_dir)):
+        name, ext = os.path.splitext(filename)
+        if ext != '.json' or not name.isdigit():
+            continue
+        if not process_alive(int(name)):
+            try:
+                os.remove(os.path.join(metrics_dir, filename))
+            except OSError:
+                pass
+            continue
+        try:
+            with open(os.path.join(metrics_dir, filename)) as f:
+                families = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"메트릭 스냅샷 읽기 오류: {e}")
+            continue
+        worker = f'worker="{name}"'
+        for family_name, help_text, kind, samples in families:
+            entry = merged.setdefault(family_name, (family_name, help_text, kind, []))
+            entry[3].extend((sample, f'{worker},{labels}' if labels else worker, value)
+                            for sample, labels, value in samples)
+    return render_families(merged.values())
+
+def flush_loop():
+    while True:
+        time.sleep(flush_interval)
+        try:
+            write_snapshot()
+        except Exception as e:
+            print(f"메트릭 스냅샷 저장 오류: {e}")
+
+def start_flusher():
+    global _flusher
+    if metrics_dir and _flusher is None:
+        _flusher = threading.Thread(target=flush_loop, name='metrics-flush', daemon=True)
+        _flusher.start()
+
+def collect_pool():
+    if db.pool is None:
+        return []
+    stats = db.pool.stats()
+    return (gauge_lines('board_db_pool_connections', 'DB pool connections by state.',
+                        [({'state': 'in_use'}, stats['in_use']), ({'state': 'idle'}, stats['idle']),
+                         ({'state': 'max'}, stats['max_size'])])
+            + gauge_lines('board_db_pool_checkouts_total', 'DB pool checkouts.', [({}, stats['checkouts'])], 'counter')
+            + gauge_lines('board_db_pool_checkout_failures_total', 'DB pool checkout failures.',
+                          [({}, stats['checkout_failures'])], 'counter')
+            + gauge_lines('board_db_pool_wait_seconds_total', 'Time spent waiting for a DB connection.',
+                          [({}, stats['wait_time'])], 'counter'))
+
+def collect_caches():
+    caches = {'topic_list': cache.topic_list_cache, 'topic': cache.topic_cache}
+    stats = {name: c.stats() for name, c in caches.items() if c is not None}
+    return (gauge_lines('board_cache_hits_total', 'Cache hits.',
+                        [({'cache': name}, s['hits']) for name, s in stats.items()], 'counter')
+            + gauge_lines('board_cache_misses_total', 'Cache misses.',
+                          [({'cache': name}, s['misses']) for name, s in stats.items()], 'counter')
+            + gauge_lines('board_cache_entries', 'Cache entries.',
+                          [({'cache': name}, s['size']) for name, s in stats.items()]))
+
+def stats_collector(prefix, source, kinds):
+    def collect():
+        stats = source.stats()
+        families = []
+        for key, kind in kinds.items():
+            name = f'{prefix}_{key}_total' if kind == 'counter' else f'{prefix}_{key}'
+            families += gauge_lines(name, f'{prefix} {key}.', [({}, stats[key])], kind)
+        return families
+    return collect
+
+class RequestStats:
+    __slots__ = ('started', 'queries', 'query_time', 'render_time', 'render_started')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.query_time = 0.0
+        self.render_time = 0.0
+        self.render_started = None
+
+def current_stats():
+    return g.get('metrics_stats') if has_request_context() else None
+
+def on_query(query, args, elapsed):
+    stats = current_stats()
+    if stats is not None:
+        stats.queries += 1
+        stats.query_time += elapsed
+
+def on_before_render(sender, template, context, **extra):
+    stats = current_stats()
+    if stats is not None:
+        stats.render_started = time.perf_counter()
+
+def on_rendered(sender, template, context, **extra):
+    stats = current_stats()
+    if stats is not None and stats.render_started is not None:
+        stats.render_time += time.perf_counter() - stats.render_started
+        stats.render_started = None
+
+def start_request():
+    g.metrics_stats = RequestStats()
+
+def finish_request(status):
+    stats = g.pop('metrics_stats', None)
+    if stats is None:
+        return
+    environ = request.environ
+    upload_bytes = 0
+    if environ.get('CONTENT_TYPE', '').startswith('multipart/form-data'):
+        upload_bytes = int(environ.get('CONTENT_LENGTH') or 0)
+    registry.observe_request(request.endpoint or 'unmatched', status, time.perf_counter() - stats.started,
+                             stats.queries, stats.query_time, stats.render_time, upload_bytes)
+
+def can_scrape():
+    if metrics_token:
+        auth = request.headers.get('Authorization', '')
+        if hmac.compare_digest(auth.encode(), f"Bearer {metrics_token}".encode()):
+            return True
+    return is_admin()
+
+def metrics_view():
+    if not can_scrape():
+        abort(404)
+    body = render_workers() if metrics_dir else registry.render()
+    return Response(body, content_type=CONTENT_TYPE)
+
+def init_metrics(app, mail=None, hasher=None):
+    global registry, metrics_dir, metrics_token, flush_interval
+    registry = MetricsRegistry()
+    metrics_dir = app.config.get('METRICS_DIR') or None
+    metrics_token = app.config.get('METRICS_TOKEN') or None
+    flush_interval = app.config.get('METRICS_FLUSH_INTERVAL', 5.0)
+    if metrics_dir:
+        os.makedirs(metrics_dir, exist_ok=True)
+    registry.add_collector(collect_pool)
+    registry.add_collector(collect_caches)
+    if hasher is not None:
+        registry.add_collector(stats_collector('board_password_hash', hasher,
+                                               {'rejected': 'counter', 'timed_out': 'counter'}))
+    if mail is not None:
+        registry.add_collector(stats_collector('board_mail', mail,
+                                               {'queued': 'gauge', 'sent': 'counter', 'failed': 'counter'}))
+
+    db.add_query_listener(on_query)
+    before_render_template.connect(on_before_render, app)
+    template_rendered.connect(on_rendered, app)
+
+    @app.before_request
+    def metrics_before_request():
+        start_request()
+
+    @app.after_request
+    def metrics_after_request(response):
+        finish_request(response.status_code)
+        return response
+
+    @app.teardown_request
+    def metrics_teardown_request(exc=None):
+        finish_request(500)
+
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
+    return registry
@@ -0,0 +1,221 @@
+from services import blobstore, listing, search
+from services.db import index_exists
+
+LOCK_NAME = 'choco_board_migrations'
+LOCK_TIMEOUT = 60
+
+def create_base_tables(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            id INT PRIMARY KEY AUTO_INCREMENT,
+            user_id VARCHAR(100) NOT NULL UNIQUE,
+            user_ps VARCHAR(255) NOT NULL,
+            user_name VARCHAR(100) NOT NULL,
+            user_school VARCHAR(100),
+            user_mail VARCHAR(100) UNIQUE,
+            profile_image VARCHAR(255)
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS topic (
+            id INT PRIMARY KEY AUTO_INCREMENT,
+            title VARCHAR(255) NOT NULL,
+            body TEXT NOT NULL,
+            post_user_id VARCHAR(100) NOT NULL,
+            post_user_name VARCHAR(100) NOT NULL,
+            is_secret BOOLEAN,
+            secret_key VARCHAR(100)
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS files (
+            id INT PRIMARY KEY AUTO_INCREMENT,
+            topic_id INT NOT NULL,
+            file_name VARCHAR(255) NOT NULL,
+            file_path VARCHAR(255) NOT NULL,
+            FOREIGN KEY (topic_id) REFERENCES topic(id) ON DELETE CASCADE
+        )
+    """)
+
+def create_board_stats(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS board_stats (
+            name VARCHAR(50) PRIMARY KEY,
+            value BIGINT NOT NULL DEFAULT 0
+        )
+    """)
+    cursor.execute("INSERT IGNORE INTO board_stats (name, value) SELECT 'topic_count', COUNT(*) FROM topic")
+
+def create_pending_deletions(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS pending_deletions (
+            id BIGINT PRIMARY KEY AUTO_INCREMENT,
+            file_path VARCHAR(255) NOT NULL,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+def add_cache_version(cursor):
+    cursor.execute("INSERT IGNORE INTO board_stats (name, value) VALUES ('cache_version', 0)")
+
+def add_topic_version(cursor):
+    cursor.execute("INSERT IGNORE INTO board_stats (name, value) VALUES ('topic_version', 0)")
+
+def add_lookup_indexes(cursor):
+    if not index_exists(cursor, 'topic', 'ix_topic_post_user_id'):
+        cursor.execute("CREATE INDEX ix_topic_post_user_id ON topic (post_user_id)")
+    if not index_exists(cursor, 'users', 'ix_users_name_school'):
+        cursor.execute("CREATE INDEX ix_users_name_school ON users (user_name, user_school)")
+
+def create_base_tables_sqlite(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id VARCHAR(100) NOT NULL UNIQUE,
+            user_ps VARCHAR(255) NOT NULL,
+            user_name VARCHAR(100) NOT NULL,
+            user_school VARCHAR(100),
+            user_mail VARCHAR(100) UNIQUE,
+            profile_image VARCHAR(255)
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS topic (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title VARCHAR(255) NOT NULL,
+            body TEXT NOT NULL,
+            post_user_id VARCHAR(100) NOT NULL,
+            post_user_name VARCHAR(100) NOT NULL,
+            is_secret BOOLEAN,
+            secret_key VARCHAR(100)
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS files (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            topic_id INT NOT NULL,
+            file_name VARCHAR(255) NOT NULL,
+            file_path VARCHAR(255) NOT NULL,
+            FOREIGN KEY (topic_id) REFERENCES topic(id) ON DELETE CASCADE
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_files_topic_id ON files (topic_id)")
+
+def create_board_stats_sqlite(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS board_stats (
+            name VARCHAR(50) PRIMARY KEY,
+            value BIGINT NOT NULL DEFAULT 0
+        )
+    """)
+    cursor.execute("INSERT OR IGNORE INTO board_stats (name, value) SELECT 'topic_count', COUNT(*) FROM topic")
+
+def skip_sqlite(cursor):
+    pass
+
+def add_list_index_sqlite(cursor):
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS {listing.LIST_INDEX} ON topic ({listing.LIST_COLUMNS})")
+
+def add_blob_indexes_sqlite(cursor):
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_files_file_path ON files (file_path)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_users_profile_image ON users (profile_image)")
+
+def create_pending_deletions_sqlite(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS pending_deletions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            file_path VARCHAR(255) NOT NULL,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+def add_cache_version_sqlite(cursor):
+    cursor.execute("INSERT OR IGNORE INTO board_stats (name, value) VALUES ('cache_version', 0)")
+
+def add_topic_version_sqlite(cursor):
+    cursor.execute("INSERT OR IGNORE INTO board_stats (name, value) VALUES ('topic_version', 0)")
+
+def add_lookup_indexes_sqlite(cursor):
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_topic_post_user_id ON topic (post_user_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_users_name_school ON users (user_name, user_school)")
+
+MIGRATIONS = [
+    (1, 'create_base_tables', create_base_tables),
+    (2, 'create_board_stats', create_board_stats),
+    (3, 'add_fulltext_indexes', search.ensure_fulltext_indexes),
+    (4, 'add_list_index', listing.ensure_list_index),
+    (5, 'add_blob_indexes', blobstore.ensure_blob_indexes),
+    (6, 'create_pending_deletions', create_pending_deletions),
+    (7, 'add_lookup_indexes', add_lookup_indexes),
+    (8, 'add_cache_version', add_cache_version),
+    (9, 'add_topic_version', add_topic_version),
+]
+
+SQLITE_MIGRATIONS = [
+    (1, 'create_base_tables', create_base_tables_sqlite),
+    (2, 'create_board_stats', create_board_stats_sqlite),
+    (3, 'add_fulltext_indexes', skip_sqlite),
+    (4, 'add_list_index', add_list_index_sqlite),
+    (5, 'add_blob_indexes', add_blob_indexes_sqlite),
+    (6, 'create_pending_deletions', create_pending_deletions_sqlite),
+    (7, 'add_lookup_indexes', add_lookup_indexes_sqlite),
+    (8, 'add_cache_version', add_cache_version_sqlite),
+    (9, 'add_topic_version', add_topic_version_sqlite),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+def is_sqlite(conn):
+    return getattr(conn, 'dialect', 'mysql') == 'sqlite'
+
+def ensure_version_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INT PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+def applied_versions(cursor):
+    cursor.execute("SELECT version FROM schema_version")
+    return {row['version'] if isinstance(row, dict) else row[0] for row in cursor.fetchall()}
+
+def current_version(conn):
+    with conn.cursor() as cursor:
+        ensure_version_table(cursor)
+        versions = applied_versions(cursor)
+    return max(versions, default=0)
+
+def pending_migrations(conn):
+    with conn.cursor() as cursor:
+        ensure_version_table(cursor)
+        versions = applied_versions(cursor)
+    migrations = SQLITE_MIGRATIONS if is_sqlite(conn) else MIGRATIONS
+    return [migration for migration in migrations if migration[0] not in versions]
+
+def upgrade(conn):
+    if is_sqlite(conn):
+        return apply_pending(conn, "INSERT OR IGNORE INTO schema_version (version, name) VALUES (%s, %s)")
+
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT GET_LOCK(%s, %s) AS locked", (LOCK_NAME, LOCK_TIMEOUT))
+        row = cursor.fetchone()
+        locked = row['locked'] if isinstance(row, dict) else row[0]
+        if locked != 1:
+            raise RuntimeError("다른 프로세스가 마이그레이션을 실행 중입니다.")
+    try:
+        return apply_pending(conn, "INSERT IGNORE INTO schema_version (version, name) VALUES (%s, %s)")
+    finally:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (LOCK_NAME,))
+
+def apply_pending(conn, record_sql):
+    applied = []
+    for version, name, migrate in pending_migrations(conn):
+        with conn.cursor() as cursor:
+            migrate(cursor)
+            cursor.execute(record_sql, (version, name))
+        conn.commit()
+        applied.append((version, name))
+    return applied
@@ -0,0 +1,115 @@
+import ast
+import importlib
+import os
+import re
+
+from services import search
+
+SCANNED_MODULES = [
+    'blueprints.auth',
+    'blueprints.main',
+    'blueprints.topic',
+    'blueprints.user',
+    'services.repos',
+    'services.search',
+]
+
+FULL_SCAN_ALLOWED = {
+    'LIKE %s': "2글자 미만 검색어는 ngram 색인을 쓸 수 없어 LIKE로 대체합니다.",
+    'SELECT COUNT(*) as total_posts FROM topic': "reconcile-topic-count 관리 명령",
+    'SELECT id, file_name, file_path FROM files': "migrate-uploads 일회성 작업",
+    'SELECT id, profile_image FROM users WHERE profile_image IS NOT NULL': "migrate-uploads 일회성 작업",
+}
+
+SQL_RE = re.compile(r'^\s*(SELECT|UPDATE|DELETE)\s', re.IGNORECASE)
+LIMIT_RE = re.compile(r'\b(LIMIT|OFFSET)\s+%s', re.IGNORECASE)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _resolve(node, namespace):
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, ast.JoinedStr):
+        parts = []
+        for value in node.values:
+            if isinstance(value, ast.Constant):
+                parts.append(value.value)
+            elif isinstance(value.value, ast.Name) and isinstance(namespace.get(value.value.id), str):
+                parts.append(namespace[value.value.id])
+            else:
+                return None
+        return ''.join(parts)
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+        left, right = _resolve(node.left, namespace), _resolve(node.right, namespace)
+        if left is not None and right is not None:
+            return left + right
+    return None
+
+def collect_queries(modules=SCANNED_MODULES):
+    queries = []
+    skipped = []
+    for module_name in modules:
+        module = importlib.import_module(module_name)
+        path = os.path.join(BASE_DIR, *module_name.split('.')) + '.py'
+        with open(path, encoding='utf-8') as f:
+            tree = ast.parse(f.read(), path)
+        namespace = vars(module)
+        nested = {id(part) for node in ast.walk(tree) if isinstance(node, (ast.JoinedStr, ast.BinOp))
+                  for part in ast.walk(node) if part is not node}
+        nested.update(id(node.value) for node in ast.walk(tree) if isinstance(node, ast.Assign)
+                      and any(isinstance(t, ast.Name) and t.id.endswith('_SQLITE') for t in node.targets))
+        for node in ast.walk(tree):
+            if id(node) in nested or not isinstance(node, (ast.Constant, ast.JoinedStr, ast.BinOp)):
+                continue
+            location = f"{module_name}:{node.lineno}"
+            sql = _resolve(node, namespace)
+            if sql is None:
+                if SQL_RE.match(ast.unparse(node).lstrip('f').strip('"\'')):
+                    skipped.append((location, ast.unparse(node)))
+            elif SQL_RE.match(sql) and '{' in sql:
+                skipped.append((location, sql))
+            elif SQL_RE.match(sql):
+                queries.append((location, ' '.join(sql.split())))
+
+    for search_type in search.SEARCH_COLUMNS:
+        sql, _ = search.build_fulltext_query(search_type, '초코')
+        queries.append((f"services.search:fulltext:{search_type}", sql + " LIMIT %s OFFSET %s"))
+
+    unique = {}
+    for location, sql in queries:
+        unique.setdefault(sql, location)
+    return [(location, sql) for sql, location in unique.items()], skipped
+
+def bind_sample_params(sql):
+    sql = LIMIT_RE.sub(lambda m: f"{m.group(1)} {'10' if m.group(1).upper() == 'LIMIT' else '0'}", sql)
+    return sql.replace('%s', "'1'")
+
+def allowed_reason(sql):
+    for pattern, reason in FULL_SCAN_ALLOWED.items():
+        if pattern in sql:
+            return reason
+    return None
+
+def table_rows(cursor):
+    cursor.execute("SELECT table_name AS name, table_rows AS row_count FROM information_schema.tables WHERE table_schema = DATABASE()")
+    return {row['name']: int(row['row_count'] or 0) for row in cursor.fetchall()}
+
+def check_query_plans(conn, min_rows=1000):
+    queries, skipped = collect_queries()
+    failures = []
+    allowed = []
+    with conn.cursor() as cursor:
+        sizes = table_rows(cursor)
+        for location, sql in queries:
+            cursor.execute("EXPLAIN " + bind_sample_params(sql))
+            for row in cursor.fetchall():
+                if row.get('type') != 'ALL':
+                    continue
+                table = row.get('table')
+                rows = max(sizes.get(table, 0), int(row.get('rows') or 0))
+                if row.get('possible_keys') is None or rows >= min_rows:
+                    reason = allowed_reason(sql)
+                    if reason:
+                        allowed.append((location, sql, table, reason))
+                    else:
+                        failures.append((location, sql, table, rows))
+    return failures, allowed, skipped
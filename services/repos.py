@@ -0,0 +1,277 @@
+from services.listing import LIST_COLUMNS
+from services.search import build_like_query, build_search_query, SEARCH_PER_PAGE, SEARCH_MAX_PER_PAGE, SEARCH_MAX_PAGE
+
+class Repo:
+    def __init__(self, conn):
+        self.conn = conn
+        self.dialect = getattr(conn, 'dialect', 'mysql')
+
+    def _one(self, sql, params=()):
+        with self.conn.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchone()
+
+    def _all(self, sql, params=()):
+        with self.conn.cursor() as cursor:
+            cursor.execute(sql, params)
+            return list(cursor.fetchall())
+
+    def _run(self, sql, params=()):
+        with self.conn.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.rowcount, cursor.lastrowid
+
+    def _many(self, sql, rows, batch_size=1000):
+        rows = list(rows)
+        with self.conn.cursor() as cursor:
+            for start in range(0, len(rows), batch_size):
+                cursor.executemany(sql, rows[start:start + batch_size])
+        return len(rows)
+
+class TopicRepo(Repo):
+    TOPIC_COUNT = 'topic_count'
+    CACHE_VERSION = 'cache_version'
+    TOPIC_VERSION = 'topic_version'
+
+    GET_WITH_FILE = ("SELECT t.*, f.topic_id AS file_topic_id, f.file_name, f.file_path "
+                     "FROM topic t LEFT JOIN files f ON f.topic_id = t.id WHERE t.id = %s LIMIT 1")
+    GET_OWNER = "SELECT post_user_id FROM topic WHERE id = %s"
+    INSERT = "INSERT INTO topic (title, body, post_user_id, post_user_name, is_secret, secret_key) VALUES (%s, %s, %s, %s, %s, %s)"
+    UPDATE = "UPDATE topic SET title=%s, body=%s WHERE id=%s"
+    DELETE = "DELETE FROM topic WHERE id = %s"
+    DELETE_BY_USER = "DELETE FROM topic WHERE post_user_id = %s"
+
+    PAGE_BEFORE = f"SELECT {LIST_COLUMNS} FROM topic WHERE id < %s ORDER BY id DESC LIMIT %s"
+    PAGE_AFTER = f"SELECT {LIST_COLUMNS} FROM topic WHERE id > %s ORDER BY id ASC LIMIT %s"
+    PAGE_OFFSET = f"SELECT {LIST_COLUMNS} FROM topic ORDER BY id DESC LIMIT %s OFFSET %s"
+
+    GET_COUNT = "SELECT value FROM board_stats WHERE name = %s"
+    ADD_COUNT = "UPDATE board_stats SET value = GREATEST(value + %s, 0) WHERE name = %s"
+    ADD_COUNT_SQLITE = "UPDATE board_stats SET value = MAX(value + %s, 0) WHERE name = %s"
+    COUNT_TOPICS = "SELECT COUNT(*) as total_posts FROM topic"
+    SET_COUNT = "INSERT INTO board_stats (name, value) VALUES (%s, %s) ON DUPLICATE KEY UPDATE value = VALUES(value)"
+    SET_COUNT_SQLITE = "INSERT INTO board_stats (name, value) VALUES (%s, %s) ON CONFLICT(name) DO UPDATE SET value = excluded.value"
+    BUMP_VERSION = "UPDATE board_stats SET value = value + 1 WHERE name = %s"
+    BUMP_VERSIONS = "UPDATE board_stats SET value = value + 1 WHERE name IN (%s, %s)"
+    GET_VERSIONS = "SELECT name, value FROM board_stats WHERE name IN (%s, %s)"
+
+    def get_with_file(self, id):
+        return self._one(self.GET_WITH_FILE, (id,))
+
+    def get_owner(self, id):
+        row = self._one(self.GET_OWNER, (id,))
+        return row['post_user_id'] if row else None
+
+    def create(self, title, body, user_id, user_name, is_secret=0, secret_key=None):
+        _, new_id = self._run(self.INSERT, (title, body, user_id, user_name, is_secret, secret_key))
+        self.add_count(1)
+        self.bump_version()
+        return new_id
+
+    def create_many(self, rows):
+        created = self._many(self.INSERT, rows)
+        self.add_count(created)
+        self.bump_version()
+        return created
+
+    def update(self, id, title, body):
+        self._run(self.UPDATE, (title, body, id))
+        self.bump_version(topics=True)
+
+    def delete(self, id):
+        deleted, _ = self._run(self.DELETE, (id,))
+        self.add_count(-deleted)
+        self.bump_version(topics=True)
+        return deleted
+
+    def delete_by_user(self, user_id):
+        deleted, _ = self._run(self.DELETE_BY_USER, (user_id,))
+        self.add_count(-deleted)
+        self.bump_version(topics=True)
+        return deleted
+
+    def page_query(self, page, per_page, before=None, after=None):
+        if before is not None:
+            return self.PAGE_BEFORE, (before, per_page + 1)
+        if after is not None:
+            return self.PAGE_AFTER, (after, per_page + 1)
+        return self.PAGE_OFFSET, (per_page + 1, (page - 1) * per_page)
+
+    def page_result(self, topics, page, per_page, before=None, after=None):
+        if before is not None:
+            return topics[:per_page], True, len(topics) > per_page
+        if after is not None:
+            return list(reversed(topics[:per_page])), len(topics) > per_page, True
+        return topics[:per_page], page > 1, len(topics) > per_page
+
+    def page(self, page, per_page, before=None, after=None):
+        sql, params = self.page_query(page, per_page, before, after)
+        return self.page_result(self._all(sql, params), page, per_page, before, after)
+
+    def search_query(self, search_type, search_name, page, per_page=SEARCH_PER_PAGE):
+        if self.dialect == 'sqlite':
+            search_query = build_like_query(search_type, search_name.strip())
+        else:
+            search_query = build_search_query(search_type, search_name)
+        if search_query is None:
+            return None
+        sql, params = search_query
+        page = min(max(page, 1), SEARCH_MAX_PAGE)
+        per_page = min(max(per_page, 1), SEARCH_MAX_PER_PAGE)
+        return sql + " LIMIT %s OFFSET %s", params + (per_page + 1, (page - 1) * per_page), page, per_page
+
+    def search_result(self, things, page, per_page):
+        has_next = len(things) > per_page and page < SEARCH_MAX_PAGE
+        return things[:per_page], page, per_page, has_next
+
+    def search(self, search_type, search_name, page, per_page=SEARCH_PER_PAGE):
+        query = self.search_query(search_type, search_name, page, per_page)
+        if query is None:
+            return None
+        sql, params, page, per_page = query
+        return self.search_result(self._all(sql, params), page, per_page)
+
+    def count(self):
+        row = self._one(self.GET_COUNT, (self.TOPIC_COUNT,))
+        return int(row['value']) if row else None
+
+    def add_count(self, delta):
+        if not delta:
+            return
+        sql = self.ADD_COUNT_SQLITE if self.dialect == 'sqlite' else self.ADD_COUNT
+        self._run(sql, (delta, self.TOPIC_COUNT))
+
+    def cache_versions(self):
+        rows = {row['name']: int(row['value']) for row in self._all(self.GET_VERSIONS, (self.CACHE_VERSION, self.TOPIC_VERSION))}
+        return rows.get(self.CACHE_VERSION), rows.get(self.TOPIC_VERSION)
+
+    def bump_version(self, topics=False):
+        if topics:
+            self._run(self.BUMP_VERSIONS, (self.CACHE_VERSION, self.TOPIC_VERSION))
+        else:
+            self._run(self.BUMP_VERSION, (self.CACHE_VERSION,))
+
+    def reconcile_count(self):
+        total_posts = int(self._one(self.COUNT_TOPICS)['total_posts'])
+        sql = self.SET_COUNT_SQLITE if self.dialect == 'sqlite' else self.SET_COUNT
+        self._run(sql, (self.TOPIC_COUNT, total_posts))
+        self.conn.commit()
+        return total_posts
+
+class UserRepo(Repo):
+    GET = "SELECT * FROM users WHERE user_id = %s"
+    GET_BY_NAME = "SELECT * FROM users WHERE user_name = %s"
+    FIND = "SELECT * FROM users WHERE user_name = %s AND user_school = %s"
+    FIND_FOR_RESET = "SELECT * FROM users WHERE user_id=%s AND user_name=%s AND user_mail=%s"
+    INSERT = "INSERT INTO users (user_id, user_ps, user_name, user_school, user_mail) VALUES (%s, %s, %s, %s, %s)"
+    SET_PASSWORD = "UPDATE users SET user_ps=%s WHERE user_id=%s"
+    SET_PASSWORD_BY_MAIL = "UPDATE users SET user_ps=%s WHERE user_mail=%s"
+    UPDATE_PROFILE = "UPDATE users SET user_name=%s, user_school=%s WHERE user_id=%s"
+    UPDATE_PROFILE_WITH_IMAGE = "UPDATE users SET user_name=%s, user_school=%s, profile_image=%s WHERE user_id=%s"
+    DELETE = "DELETE FROM users WHERE user_id = %s"
+    PROFILE_IMAGES = "SELECT id, profile_image FROM users WHERE profile_image IS NOT NULL"
+    SET_PROFILE_IMAGE = "UPDATE users SET profile_image=%s WHERE id=%s"
+
+    def get(self, user_id):
+        return self._one(self.GET, (user_id,))
+
+    def get_by_name(self, user_name):
+        return self._one(self.GET_BY_NAME, (user_name,))
+
+    def find(self, user_name, user_school):
+        return self._one(self.FIND, (user_name, user_school))
+
+    def find_for_reset(self, user_id, user_name, user_mail):
+        return self._one(self.FIND_FOR_RESET, (user_id, user_name, user_mail))
+
+    def create(self, user_id, user_ps, user_name, user_school, user_mail):
+        self._run(self.INSERT, (user_id, user_ps, user_name, user_school, user_mail))
+
+    def create_many(self, rows):
+        return self._many(self.INSERT, rows)
+
+    def set_password(self, user_id, user_ps):
+        self._run(self.SET_PASSWORD, (user_ps, user_id))
+
+    def set_password_by_mail(self, user_mail, user_ps):
+        self._run(self.SET_PASSWORD_BY_MAIL, (user_ps, user_mail))
+
+    def update_profile(self, user_id, user_name, user_school, profile_image=None):
+        if profile_image:
+            self._run(self.UPDATE_PROFILE_WITH_IMAGE, (user_name, user_school, profile_image, user_id))
+        else:
+            self._run(self.UPDATE_PROFILE, (user_name, user_school, user_id))
+
+    def delete(self, user_id):
+        deleted, _ = self._run(self.DELETE, (user_id,))
+        return deleted
+
+    def profile_images(self):
+        return self._all(self.PROFILE_IMAGES)
+
+    def set_profile_image(self, id, relpath):
+        self._run(self.SET_PROFILE_IMAGE, (relpath, id))
+
+class FileRepo(Repo):
+    FOR_TOPIC = "SELECT file_path FROM files WHERE topic_id = %s"
+    FOR_USER_TOPICS = "SELECT f.file_path FROM files f JOIN topic t ON f.topic_id = t.id WHERE t.post_user_id = %s"
+    INSERT = "INSERT INTO files (topic_id, file_name, file_path) VALUES (%s, %s, %s)"
+    DELETE_FOR_TOPIC = "DELETE FROM files WHERE topic_id = %s"
+    ALL = "SELECT id, file_name, file_path FROM files"
+    SET_PATH = "UPDATE files SET file_path=%s WHERE id=%s"
+
+    REFERENCED_FILES = "SELECT file_path FROM files WHERE file_path IN ({placeholders})"
+    REFERENCED_PROFILES = "SELECT profile_image FROM users WHERE profile_image IN ({placeholders})"
+
+    SCHEDULE_DELETION = "INSERT INTO pending_deletions (file_path) VALUES (%s)"
+    CLAIM_PENDING = "SELECT id, file_path FROM pending_deletions ORDER BY id LIMIT %s FOR UPDATE SKIP LOCKED"
+    CLAIM_PENDING_SQLITE = "SELECT id, file_path FROM pending_deletions ORDER BY id LIMIT %s"
+    DELETE_PENDING = "DELETE FROM pending_deletions WHERE id IN ({placeholders})"
+
+    def paths_for_topic(self, topic_id):
+        return [row['file_path'] for row in self._all(self.FOR_TOPIC, (topic_id,))]
+
+    def paths_for_user_topics(self, user_id):
+        return [row['file_path'] for row in self._all(self.FOR_USER_TOPICS, (user_id,))]
+
+    def add(self, topic_id, file_name, file_path):
+        self._run(self.INSERT, (topic_id, file_name, file_path))
+
+    def add_many(self, rows):
+        return self._many(self.INSERT, rows)
+
+    def replace_for_topic(self, topic_id, file_name, file_path):
+        old_paths = self.paths_for_topic(topic_id)
+        self._run(self.DELETE_FOR_TOPIC, (topic_id,))
+        self.add(topic_id, file_name, file_path)
+        return old_paths
+
+    def all(self):
+        return self._all(self.ALL)
+
+    def set_path(self, id, relpath):
+        self._run(self.SET_PATH, (relpath, id))
+
+    def referenced(self, relpaths):
+        relpaths = list(relpaths)
+        if not relpaths:
+            return set()
+        placeholders = ', '.join(['%s'] * len(relpaths))
+        referenced = set()
+        for sql in (self.REFERENCED_FILES, self.REFERENCED_PROFILES):
+            for row in self._all(sql.format(placeholders=placeholders), relpaths):
+                referenced.update(row.values())
+        return referenced
+
+    def schedule_deletion(self, relpaths):
+        return self._many(self.SCHEDULE_DELETION, [(relpath,) for relpath in relpaths])
+
+    def claim_pending(self, batch_size):
+        sql = self.CLAIM_PENDING_SQLITE if self.dialect == 'sqlite' else self.CLAIM_PENDING
+        return self._all(sql, (batch_size,))
+
+    def delete_pending(self, ids):
+        ids = list(ids)
+        if ids:
+            placeholders = ', '.join(['%s'] * len(ids))
+            self._run(self.DELETE_PENDING.format(placeholders=placeholders), ids)
@@ -0,0 +1,49 @@
+from services.db import index_exists
+from services.listing import LIST_COLUMNS
+
+NGRAM_TOKEN_SIZE = 2
+SEARCH_PER_PAGE = 20
+SEARCH_MAX_PER_PAGE = 100
+SEARCH_MAX_PAGE = 50
+
+SEARCH_COLUMNS = {
+    'title': 'title',
+    'body': 'body',
+    'title_body': 'title, body',
+}
+
+FULLTEXT_INDEXES = {
+    'ft_topic_title': 'title',
+    'ft_topic_body': 'body',
+    'ft_topic_title_body': 'title, body',
+}
+
+def build_like_query(search_type, search_name):
+    query = f"%{search_name}%"
+    if search_type == 'title':
+        return f"SELECT {LIST_COLUMNS} FROM topic WHERE title LIKE %s ORDER BY id DESC", (query,)
+    elif search_type == 'body':
+        return f"SELECT {LIST_COLUMNS} FROM topic WHERE body LIKE %s ORDER BY id DESC", (query,)
+    elif search_type == 'title_body':
+        return f"SELECT {LIST_COLUMNS} FROM topic WHERE title LIKE %s OR body LIKE %s ORDER BY id DESC", (query, query)
+    return None
+
+def build_fulltext_query(search_type, search_name):
+    columns = SEARCH_COLUMNS.get(search_type)
+    if columns is None:
+        return None
+    phrase = '"' + search_name.replace('"', ' ').strip() + '"'
+    match = f"MATCH({columns}) AGAINST(%s IN BOOLEAN MODE)"
+    sql = f"SELECT {LIST_COLUMNS}, {match} AS score FROM topic WHERE {match} ORDER BY score DESC, id DESC"
+    return sql, (phrase, phrase)
+
+def build_search_query(search_type, search_name):
+    search_name = search_name.strip()
+    if len(search_name.replace('"', '')) < NGRAM_TOKEN_SIZE:
+        return build_like_query(search_type, search_name)
+    return build_fulltext_query(search_type, search_name)
+
+def ensure_fulltext_indexes(cursor):
+    for index_name, columns in FULLTEXT_INDEXES.items():
+        if not index_exists(cursor, 'topic', index_name):
+            cursor.execute(f"ALTER TABLE topic ADD FULLTEXT INDEX {index_name} ({columns}) WITH PARSER ngram")
@@ -0,0 +1,213 @@
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from itsdangerous import BadSignature, Signer
+from werkzeug.datastructures import CallbackDict
+import os
+import secrets
+import sqlite3
+import threading
+import time
+
+SID_BYTES = 18
+PURGE_EVERY = 500
+
+serializer = TaggedJSONSerializer()
+
+class ServerSession(CallbackDict, SessionMixin):
+    def __init__(self, initial=None, sid=None, expires_at=None):
+        def on_update(self):
+            self.modified = True
+            self.accessed = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.expires_at = expires_at
+        self.new = sid is None
+        self.modified = False
+        self.accessed = False
+        self.regenerated = False
+
+    def clear(self):
+        super().clear()
+        self.regenerated = True
+
+class MemorySessionStore:
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def load(self, sid):
+        with self._lock:
+            entry = self._data.get(sid)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                del self._data[sid]
+                return None
+            return serializer.loads(entry[0]), entry[1]
+
+    def save(self, sid, data, expires_at):
+        value = serializer.dumps(data)
+        with self._lock:
+            self._data[sid] = (value, expires_at)
+            if len(self._data) > self.maxsize:
+                self._purge()
+                while len(self._data) > self.maxsize:
+                    self._data.pop(next(iter(self._data)))
+
+    def touch(self, sid, expires_at):
+        with self._lock:
+            entry = self._data.get(sid)
+            if entry is not None:
+                self._data[sid] = (entry[0], expires_at)
+
+    def delete(self, sid):
+        with self._lock:
+            self._data.pop(sid, None)
+
+    def _purge(self):
+        now = time.time()
+        for sid in [sid for sid, (_, expires_at) in self._data.items() if expires_at <= now]:
+            del self._data[sid]
+
+class SQLiteSessionStore:
+    def __init__(self, path, timeout=5):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._saves = 0
+        conn = sqlite3.connect(self.path, timeout=self.timeout)
+        try:
+            with conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS sessions (
+                        sid TEXT PRIMARY KEY,
+                        data TEXT NOT NULL,
+                        expires_at REAL NOT NULL
+                    )
+                """)
+        finally:
+            conn.close()
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def load(self, sid):
+        row = self._conn().execute("SELECT data, expires_at FROM sessions WHERE sid = ?", (sid,)).fetchone()
+        if row is None or row[1] <= time.time():
+            return None
+        return serializer.loads(row[0]), row[1]
+
+    def save(self, sid, data, expires_at):
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT INTO sessions (sid, data, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(sid) DO UPDATE SET data = excluded.data, expires_at = excluded.expires_at",
+                (sid, serializer.dumps(data), expires_at)
+            )
+        self._saves += 1
+        if self._saves % PURGE_EVERY == 0:
+            self.purge()
+
+    def touch(self, sid, expires_at):
+        with self._conn() as conn:
+            conn.execute("UPDATE sessions SET expires_at = ? WHERE sid = ?", (expires_at, sid))
+
+    def delete(self, sid):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM sessions WHERE sid = ?", (sid,))
+
+    def purge(self):
+        with self._conn() as conn:
+            return conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (time.time(),)).rowcount
+
+class ServerSessionInterface(SessionInterface):
+    salt = 'server-session'
+
+    def __init__(self, store, lifetime):
+        self.store = store
+        self.lifetime = lifetime
+
+    def get_signer(self, app):
+        if not app.secret_key:
+            return None
+        return Signer(app.secret_key, salt=self.salt)
+
+    def open_session(self, app, request):
+        signer = self.get_signer(app)
+        if signer is None:
+            return None
+        cookie = request.cookies.get(self.get_cookie_name(app))
+        if not cookie:
+            return ServerSession()
+        try:
+            sid = signer.unsign(cookie).decode()
+        except BadSignature:
+            return ServerSession()
+        loaded = self.store.load(sid)
+        if loaded is None:
+            return ServerSession()
+        data, expires_at = loaded
+        return ServerSession(data, sid, expires_at)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if session.accessed:
+            response.vary.add('Cookie')
+
+        if not session:
+            if session.modified and session.sid:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path,
+                                       secure=self.get_cookie_secure(app),
+                                       samesite=self.get_cookie_samesite(app),
+                                       httponly=self.get_cookie_httponly(app))
+                response.vary.add('Cookie')
+            return
+
+        now = time.time()
+        expires_at = now + self.lifetime
+        if session.modified:
+            if session.regenerated and session.sid:
+                self.store.delete(session.sid)
+                session.sid = None
+            if session.sid is None:
+                session.sid = secrets.token_urlsafe(SID_BYTES)
+            self.store.save(session.sid, dict(session), expires_at)
+        elif session.expires_at is not None and session.expires_at - now < self.lifetime / 2:
+            self.store.touch(session.sid, expires_at)
+        elif not (session.permanent and app.config['SESSION_REFRESH_EACH_REQUEST']):
+            return
+
+        response.set_cookie(
+            name,
+            self.get_signer(app).sign(session.sid).decode(),
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+        )
+        response.vary.add('Cookie')
+
+def init_sessions(app):
+    if app.config['SESSION_BACKEND'] == 'memory':
+        store = MemorySessionStore(app.config['SESSION_MEMORY_MAX'])
+    elif app.config['SESSION_BACKEND'] == 'sqlite':
+        store = SQLiteSessionStore(app.config['SESSION_SQLITE_PATH'])
+    else:
+        return None
+    app.session_interface = ServerSessionInterface(store, app.config['SESSION_LIFETIME'])
+    return store
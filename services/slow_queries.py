@@ -0,0 +1,171 @@
+from collections import deque
+from flask import abort, has_request_context, render_template, request, session
+import hashlib
+import os
+import queue
+import re
+import threading
+import time
+
+from services import db
+
+EXPLAINABLE = ('SELECT', 'UPDATE', 'DELETE')
+
+WHITESPACE_RE = re.compile(r'\s+')
+STRING_RE = re.compile(r"'(?:[^'\\]|\\.)*'")
+NUMBER_RE = re.compile(r'\b\d+\b')
+IN_LIST_RE = re.compile(r'\bIN\s*\((?:\s*\?\s*,)*\s*\?\s*\)', re.IGNORECASE)
+
+log = None
+admin_ids = set()
+
+def normalize(query):
+    sql = WHITESPACE_RE.sub(' ', query).strip()
+    sql = STRING_RE.sub('?', sql.replace('%s', '?'))
+    sql = NUMBER_RE.sub('?', sql)
+    return IN_LIST_RE.sub('IN (...)', sql)
+
+def fingerprint(text):
+    return hashlib.sha1(text.encode()).hexdigest()[:12]
+
+def params_fingerprint(args):
+    if args is None:
+        return '-'
+    if isinstance(args, dict):
+        args = sorted(args.items())
+    return fingerprint(repr(tuple(args)))
+
+class QueryStats:
+    __slots__ = ('sql', 'calls', 'total_time', 'max_time', 'slow_calls', 'views')
+
+    def __init__(self, sql):
+        self.sql = sql
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.slow_calls = 0
+        self.views = set()
+
+class SlowQueryLog:
+    def __init__(self, threshold=0.2, recent_size=100, top_n=20, explain_queue_size=32):
+        self.threshold = threshold
+        self.top_n = top_n
+        self.recent = deque(maxlen=recent_size)
+        self.plans = {}
+
+        self._stats = {}
+        self._normalized = {}
+        self._lock = threading.Lock()
+        self._explain_queue = queue.Queue(maxsize=explain_queue_size)
+        self._thread = None
+        self.dropped_explains = 0
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._explain_loop, name='slow-query-explain', daemon=True)
+            self._thread.start()
+        return self
+
+    def on_query(self, query, args, elapsed):
+        if query.startswith('EXPLAIN'):
+            return
+        view = request.endpoint if has_request_context() else None
+        with self._lock:
+            shape = self._normalized.get(query)
+            if shape is None:
+                if len(self._normalized) >= 4096:
+                    self._normalized.clear()
+                sql = normalize(query)
+                shape = self._normalized[query] = (sql, fingerprint(sql))
+            sql, key = shape
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = QueryStats(sql)
+            stats.calls += 1
+            stats.total_time += elapsed
+            stats.max_time = max(stats.max_time, elapsed)
+            if view:
+                stats.views.add(view)
+            if elapsed < self.threshold:
+                return
+            stats.slow_calls += 1
+            entry = {
+                'at': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'fingerprint': key,
+                'sql': sql,
+                'params': params_fingerprint(args),
+                'view': view or '-',
+                'elapsed_ms': elapsed * 1000,
+            }
+            self.recent.appendleft(entry)
+            needs_plan = key not in self.plans
+
+        print(f"느린 쿼리 {entry['elapsed_ms']:.1f}ms [{entry['view']}] {sql} (params {entry['params']})")
+        if needs_plan and query.lstrip().upper().startswith(EXPLAINABLE):
+            try:
+                self._explain_queue.put_nowait((key, query, args))
+            except queue.Full:
+                self.dropped_explains += 1
+
+    def _explain_loop(self):
+        while True:
+            key, query, args = self._explain_queue.get()
+            if key in self.plans:
+                continue
+            try:
+                with db.pool.connection() as conn:
+                    self.plans[key] = explain(conn, query, args)
+            except Exception as e:
+                print(f"느린 쿼리 실행 계획 수집 오류: {e}")
+
+    def top(self, n=None):
+        with self._lock:
+            ranked = sorted(self._stats.items(), key=lambda item: item[1].total_time, reverse=True)
+            return [{
+                'fingerprint': key,
+                'sql': stats.sql,
+                'calls': stats.calls,
+                'slow_calls': stats.slow_calls,
+                'total_ms': stats.total_time * 1000,
+                'avg_ms': stats.total_time / stats.calls * 1000,
+                'max_ms': stats.max_time * 1000,
+                'views': ', '.join(sorted(stats.views)) or '-',
+                'plan': self.plans.get(key),
+            } for key, stats in ranked[:n or self.top_n]]
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self.recent.clear()
+            self.plans.clear()
+
+def explain(conn, query, args):
+    prefix = "EXPLAIN QUERY PLAN " if getattr(conn, 'dialect', 'mysql') == 'sqlite' else "EXPLAIN "
+    with conn.cursor() as cursor:
+        cursor.execute(prefix + query, args)
+        return cursor.fetchall()
+
+def is_admin():
+    return session.get('logged_in') and session.get('user_id') in admin_ids
+
+def slow_queries_view():
+    if not is_admin():
+        abort(404)
+    return render_template('slow_queries.html', top=log.top(), recent=list(log.recent),
+                           threshold_ms=log.threshold * 1000, worker_pid=os.getpid())
+
+def on_query(query, args, elapsed):
+    if log is not None:
+        log.on_query(query, args, elapsed)
+
+def init_slow_query_log(app):
+    global log, admin_ids
+    admin_ids = {user_id.strip() for user_id in app.config['ADMIN_USER_IDS'].split(',') if user_id.strip()}
+    log = SlowQueryLog(
+        threshold=app.config['SLOW_QUERY_THRESHOLD_MS'] / 1000,
+        recent_size=app.config['SLOW_QUERY_LOG_SIZE'],
+        top_n=app.config['SLOW_QUERY_TOP_N'],
+    )
+    db.add_query_listener(on_query)
+    app.add_url_rule('/admin/slow-queries', 'slow_queries', slow_queries_view)
+    return log
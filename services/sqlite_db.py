@@ -0,0 +1,92 @@
+import functools
+import sqlite3
+import time
+
+from services import db
+
+STATEMENT_CACHE_SIZE = 256
+
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def translate(query):
+    return query.replace('%s', '?')
+
+def dict_factory(cursor, row):
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+class SQLiteCursor:
+    def __init__(self, conn):
+        self._cursor = conn.cursor()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def execute(self, query, args=None):
+        sql = translate(query)
+        params = tuple(args or ())
+        if not db.query_listeners:
+            self._cursor.execute(sql, params)
+            return self._cursor.rowcount
+        started = time.perf_counter()
+        try:
+            self._cursor.execute(sql, params)
+            return self._cursor.rowcount
+        finally:
+            elapsed = time.perf_counter() - started
+            for listener in list(db.query_listeners):
+                listener(query, args, elapsed)
+
+    def executemany(self, query, args):
+        self._cursor.executemany(translate(query), [tuple(row) for row in args])
+        return self._cursor.rowcount
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def close(self):
+        self._cursor.close()
+
+class SQLiteConnection:
+    dialect = 'sqlite'
+
+    def __init__(self, path, timeout=5):
+        self._conn = sqlite3.connect(path, timeout=timeout, check_same_thread=False,
+                                     cached_statements=STATEMENT_CACHE_SIZE)
+        self._conn.row_factory = dict_factory
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+
+    def cursor(self):
+        return SQLiteCursor(self._conn)
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def ping(self, reconnect=False):
+        self._conn.execute("SELECT 1").fetchone()
+
+    def close(self):
+        self._conn.close()
+
+class SQLitePool(db.ConnectionPool):
+    def _connect(self):
+        conn = SQLiteConnection(self.db_config['path'], timeout=self.timeout)
+        conn._pool_created_at = time.monotonic()
+        return conn
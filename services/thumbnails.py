@@ -0,0 +1,117 @@
+from concurrent.futures.process import BrokenProcessPool
+from flask import url_for
+import functools
+import os
+import tempfile
+import threading
+
+VARIANT_WIDTHS = (160, 320, 640)
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+upload_folder = None
+max_workers = 2
+max_pending = 16
+
+_executor = None
+_executor_lock = threading.Lock()
+_pending = None
+
+def init_thumbnails(app):
+    global upload_folder, max_workers, max_pending, _pending
+    upload_folder = app.config['UPLOAD_FOLDER']
+    max_workers = app.config['THUMBNAIL_WORKERS']
+    max_pending = app.config['THUMBNAIL_MAX_PENDING']
+    _pending = threading.BoundedSemaphore(max_pending)
+    app.jinja_env.globals['image_url'] = image_url
+    app.jinja_env.globals['is_image'] = is_image
+
+def is_image(relpath):
+    return bool(relpath) and os.path.splitext(relpath)[1].lower() in IMAGE_EXTENSIONS
+
+def variant_relpath(relpath, width):
+    return f"{os.path.splitext(relpath)[0]}_w{width}.jpg"
+
+def variant_relpaths(relpath):
+    return [variant_relpath(relpath, width) for width in VARIANT_WIDTHS]
+
+def image_url(relpath, width):
+    from services.blobstore import is_blob_path, stored_relpath
+    if not is_blob_path(relpath):
+        return url_for('static', filename='uploads/' + stored_relpath(relpath))
+    chosen = relpath
+    for variant_width in VARIANT_WIDTHS:
+        if variant_width >= width:
+            candidate = variant_relpath(relpath, variant_width)
+            if os.path.exists(os.path.join(upload_folder, candidate)):
+                chosen = candidate
+            break
+    return url_for('static', filename='uploads/' + chosen)
+
+def make_variants(src_path, widths):
+    from PIL import Image, ImageOps
+
+    base = os.path.splitext(src_path)[0]
+    with Image.open(src_path) as image:
+        image = ImageOps.exif_transpose(image).convert('RGB')
+        for width in widths:
+            dest = f"{base}_w{width}.jpg"
+            if os.path.exists(dest):
+                continue
+            variant = image.copy()
+            variant.thumbnail((width, width * 4))
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(dest), prefix='.variant-')
+            try:
+                with os.fdopen(fd, 'wb') as out:
+                    variant.save(out, 'JPEG', quality=82, optimize=True, progressive=True)
+                os.replace(tmp_path, dest)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            from concurrent.futures import ProcessPoolExecutor
+            import multiprocessing
+            _executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('forkserver'))
+        return _executor
+
+def _drop_executor(executor):
+    # 워커가 죽어 깨진 풀은 버리고 다음 작업에서 새로 만든다
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False)
+
+def _on_done(executor, future):
+    _pending.release()
+    e = future.exception()
+    if e is not None:
+        print(f"썸네일 생성 오류: {e}")
+        if isinstance(e, BrokenProcessPool):
+            _drop_executor(executor)
+
+def schedule_variants(relpath):
+    if not is_image(relpath) or _pending is None:
+        return False
+    try:
+        import PIL
+    except ImportError:
+        return False
+    if not _pending.acquire(blocking=False):
+        return False
+
+    executor = _get_executor()
+    try:
+        future = executor.submit(make_variants, os.path.join(upload_folder, relpath), VARIANT_WIDTHS)
+    except Exception as e:
+        _pending.release()
+        print(f"썸네일 작업 등록 오류: {e}")
+        if isinstance(e, BrokenProcessPool):
+            _drop_executor(executor)
+        return False
+    future.add_done_callback(functools.partial(_on_done, executor))
+    return True
@@ -0,0 +1,32 @@
+from collections import namedtuple
+import hashlib
+import os
+import tempfile
+
+CHUNK_SIZE = 64*1024
+
+SavedUpload = namedtuple('SavedUpload', ['path', 'size', 'sha256'])
+
+class UploadTooLarge(Exception):
+    pass
+
+def receive_upload(file_storage, directory, max_size):
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.upload-')
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            while True:
+                chunk = file_storage.stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise UploadTooLarge(f"{max_size} 바이트를 초과했습니다.")
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+    return SavedUpload(tmp_path, size, digest.hexdigest())
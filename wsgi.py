@@ -0,0 +1,9 @@
+import app as board
+
+app = board.create_app(preload=True)
+board.init_db(app)
+board.preload_templates(app)
+
+def post_fork():
+    board.start_worker(app)
+    board.warm_caches(app)